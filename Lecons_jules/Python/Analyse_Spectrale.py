@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+Noyau d'analyse spectrale pour Décomposition_tous : spectre (FFT réelle)
+d'un signal échantillonné sur une période et sommes partielles de sa
+série de Fourier, tenues à jour de façon incrémentale.
+
+Quand le curseur passe de k à k+1 harmoniques (ou revient de k+1 à k), on
+ajoute (ou retranche) à la somme courante la seule harmonique concernée,
+en O(n) pour n échantillons. Pour l'évaluer sans fonction trigonométrique
+ni indexation aléatoire, on range les n échantillons en un tableau p x L
+(n=pL, m=qL+r) :
+    exp(2i pi j m/n) = exp(2i pi j q L/n) * exp(2i pi j r/n),
+produit extérieur de deux vecteurs de p et L valeurs (L voisin de racine
+de n). Un grand saut du curseur est traité par une FFT réelle inverse du
+spectre tronqué, qui sert aussi, de temps en temps, à éliminer les
+erreurs d'arrondi accumulées.
+
+Pour les enregistrements longs (Lecture_Signaux), stft calcule une
+transformée de Fourier à court terme en un seul passage sur un signal
+projeté en mémoire ou fourni par blocs (générateur) : trames fenêtrées qui
+se recouvrent, traitées par lots (une FFT réelle pour tout le lot), la
+mémoire occupée ne dépendant que de la taille des lots. Spectrogramme
+accumule ces lots en au plus max_colonnes colonnes, en moyennant les
+colonnes deux à deux chaque fois que ce nombre est atteint : une heure
+enregistrée à 48 kHz passe ainsi en mémoire bornée. suivi_harmoniques
+estime éventuellement, trame par trame, le fondamental (produit spectral
+harmonique) et la puissance des premières harmoniques.
+"""
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+import scipy.fft
+
+SAUT_MAX=8          # au-delà de ce nombre d'harmoniques, on repart de la FFT inverse
+RESYNCHRONISATION=1000  # nombre de mises à jour incrémentales entre deux FFT inverses
+TRAMES_PAR_LOT=256  # trames de la transformée à court terme traitées à la fois
+
+def _diviseur(n):
+    '''plus grand diviseur de n inférieur ou égal à sa racine'''
+    for L in range(int(np.sqrt(n)),0,-1):
+        if n%L==0:
+            return L
+
+class Reconstruction:
+    def __init__(self,Y):
+        '''
+            : param Y : échantillons d'une période du signal
+        '''
+        Y=np.asarray(Y,dtype=float)
+        self.n=len(Y)
+        self.spectre=scipy.fft.rfft(Y)
+        # amplitudes des harmoniques (valeur moyenne pour j=0)
+        self.amplitudes=2*np.abs(self.spectre)/self.n
+        self.amplitudes[0]/=2
+        if self.n%2==0:
+            self.amplitudes[-1]/=2
+        self.L=_diviseur(self.n)
+        self._q=np.arange(self.n//self.L)*self.L
+        self._r=np.arange(self.L)
+        self.k=0
+        self.signal=np.full(self.n,self.spectre[0].real/self.n)
+        self._mises_a_jour=0
+
+    def _ajoute(self,j,signe):
+        '''ajoute (signe=1) ou retranche (signe=-1) l'harmonique j à self.signal'''
+        c=signe*self.spectre[j]*(1 if 2*j==self.n else 2)/self.n
+        u=c*np.exp(2j*np.pi*j/self.n*self._q)
+        v=np.exp(2j*np.pi*j/self.n*self._r)
+        S=self.signal.reshape(-1,self.L)
+        S+=u.real[:,None]*v.real
+        S-=u.imag[:,None]*v.imag
+
+    def _recalcule(self,k):
+        X=np.zeros_like(self.spectre)
+        X[:k+1]=self.spectre[:k+1]
+        self.signal=scipy.fft.irfft(X,self.n)
+        self._mises_a_jour=0
+
+    def regle(self,k):
+        '''somme partielle des harmoniques 0 à k (tableau de n échantillons,
+        modifié en place par les appels suivants)'''
+        k=int(np.clip(k,0,len(self.spectre)-1))
+        if abs(k-self.k)>SAUT_MAX or self._mises_a_jour+abs(k-self.k)>RESYNCHRONISATION:
+            self._recalcule(k)
+        else:
+            for j in range(self.k+1,k+1):
+                self._ajoute(j,1)
+            for j in range(self.k,k,-1):
+                self._ajoute(j,-1)
+            self._mises_a_jour+=abs(k-self.k)
+        self.k=k
+        return self.signal
+
+
+""" -----------------------
+    Transformée de Fourier à court terme en flux
+    ----------------------- """
+def _blocs(source,taille_bloc):
+    '''blocs successifs d'au plus taille_bloc échantillons d'un tableau
+    (éventuellement projeté en mémoire) ou d'un itérable de blocs, les blocs
+    trop longs de ce dernier étant redécoupés'''
+    for bloc in ([source] if hasattr(source,'shape') else source):
+        bloc=bloc if hasattr(bloc,'shape') else np.asarray(bloc)
+        for debut in range(0,len(bloc),taille_bloc):
+            yield bloc[debut:debut+taille_bloc]
+
+def stft(source,fe,taille=4096,pas=1024,trames_par_lot=TRAMES_PAR_LOT):
+    '''
+        générateur des lots de trames de la transformée à court terme
+        : param source : tableau ou itérable de blocs d'échantillons
+        : param taille : nombre d'échantillons par trame (fenêtre de Hann)
+        : param pas : décalage entre deux trames successives
+        : return : pour chaque lot, instants des centres des trames (s) et
+                   densité spectrale de puissance (trames x fréquences)
+    '''
+    fenetre=np.hanning(taille+1)[:-1].astype(np.float32)
+    normalisation=1/(fe*np.sum(fenetre**2))
+    reste=np.zeros(0,dtype=np.float32)
+    indice=0    # rang, dans le signal, du premier échantillon de reste
+    for bloc in _blocs(source,pas*trames_par_lot):
+        tampon=np.concatenate([reste,np.asarray(bloc,dtype=np.float32)])
+        n=(len(tampon)-taille)//pas+1 if len(tampon)>=taille else 0
+        if n>0:
+            trames=np.lib.stride_tricks.sliding_window_view(tampon,taille)[::pas][:n]
+            X=scipy.fft.rfft(trames*fenetre,axis=1,workers=-1)
+            P=X.real**2+X.imag**2
+            P[:,1:-1]*=2*normalisation
+            P[:,[0,-1]]*=normalisation
+            yield (indice+np.arange(n)*pas+taille/2)/fe,P
+            reste=tampon[n*pas:]
+            indice+=n*pas
+        else:
+            reste=tampon
+
+class Spectrogramme:
+    def __init__(self,max_colonnes=4096):
+        '''
+            spectrogramme en mémoire bornée
+            : param max_colonnes : nombre maximal de colonnes (instants) conservées
+        '''
+        self.max_colonnes=max_colonnes+max_colonnes%2   # nombre pair
+        self.regroupement=1     # nombre de trames moyennées par colonne
+        self.colonnes=0
+        self.puissance=None
+        self.instants=np.zeros(self.max_colonnes)
+        self._somme=0.
+        self._t=0.
+        self._compte=0
+
+    def _pousse(self,P,t):
+        if self.colonnes==self.max_colonnes:
+            # on moyenne les colonnes deux à deux
+            m=self.colonnes//2
+            self.puissance[:m]=(self.puissance[0:2*m:2]+self.puissance[1:2*m:2])/2
+            self.instants[:m]=(self.instants[0:2*m:2]+self.instants[1:2*m:2])/2
+            self.colonnes=m
+            self.regroupement*=2
+            # la colonne en cours de remplissage est de taille différente :
+            # on la compte à part
+            self._somme=self._somme+P*(self.regroupement//2)
+            self._t+=t*(self.regroupement//2)
+            self._compte+=self.regroupement//2
+            return
+        self.puissance[self.colonnes]=P
+        self.instants[self.colonnes]=t
+        self.colonnes+=1
+
+    def ajoute(self,t,P):
+        '''ajoute un lot de trames (cf. stft)'''
+        if self.puissance is None:
+            self.puissance=np.zeros((self.max_colonnes,P.shape[1]),dtype=np.float32)
+        i=0
+        while i<len(P):
+            k=min(self.regroupement-self._compte,len(P)-i)
+            self._somme=self._somme+P[i:i+k].sum(axis=0)
+            self._t+=t[i:i+k].sum()
+            self._compte+=k
+            i+=k
+            if self._compte==self.regroupement:
+                P_moyen,t_moyen=self._somme/self._compte,self._t/self._compte
+                self._somme,self._t,self._compte=0.,0.,0
+                self._pousse(P_moyen,t_moyen)
+
+    def resultat(self):
+        '''instants (s) et densité spectrale de puissance des colonnes conservées,
+        suivies, s'il y en a une, de la colonne en cours de remplissage (moyenne
+        des trames déjà reçues) ; l'état n'est pas modifié. Tableaux vides si
+        aucune trame n'a été reçue (signal plus court qu'une trame)'''
+        if self.puissance is None:
+            return np.zeros(0),np.zeros((0,0),dtype=np.float32)
+        instants,puissance=self.instants[:self.colonnes],self.puissance[:self.colonnes]
+        if self._compte==0:
+            return instants,puissance
+        return (np.append(instants,self._t/self._compte),
+                np.concatenate([puissance,[self._somme/self._compte]]).astype(puissance.dtype))
+
+def suivi_harmoniques(P,fe,taille,K=10,f_min=20.,f_max=2000.,R=3):
+    '''
+        fondamental de chaque trame (produit spectral harmonique d'ordre R,
+        affiné par interpolation parabolique) et puissance des K premières
+        harmoniques (trames x K)
+    '''
+    df=fe/taille
+    logP=np.log(P+1e-30)
+    m=P.shape[1]//R
+    produit=sum(logP[:,:m*r:r][:,:m] for r in range(1,R+1))
+    i_min,i_max=max(1,int(f_min/df)),min(m-2,int(f_max/df))
+    i=i_min+np.argmax(produit[:,i_min:i_max+1],axis=1)
+    lignes=np.arange(len(P))
+    a,b,c=logP[lignes,i-1],logP[lignes,i],logP[lignes,i+1]
+    f0=(i+0.5*(a-c)/(a-2*b+c))*df
+    rangs=np.rint(np.outer(f0,np.arange(1,K+1))/df).astype(int)
+    harmoniques=np.take_along_axis(P,np.minimum(rangs,P.shape[1]-1),axis=1)
+    return f0,harmoniques
+
+def analyse_longue(source,fe,taille=4096,pas=1024,max_colonnes=4096,K=None,**options):
+    '''
+        spectrogramme d'un long signal en un seul passage ; avec K harmoniques,
+        renvoie aussi les instants, le fondamental et la puissance des
+        harmoniques de chaque trame
+    '''
+    spectrogramme=Spectrogramme(max_colonnes)
+    suivi=[]
+    for t,P in stft(source,fe,taille,pas):
+        spectrogramme.ajoute(t,P)
+        if K:
+            suivi.append((t,)+suivi_harmoniques(P,fe,taille,K,**options))
+    if not K:
+        return spectrogramme
+    if not suivi:
+        # signal plus court qu'une trame : aucune trame analysée
+        return spectrogramme,np.zeros(0),np.zeros(0),np.zeros((0,K))
+    t,f0,harmoniques=(np.concatenate(x) for x in zip(*suivi))
+    return spectrogramme,t,f0,harmoniques
+
+
+if __name__=='__main__':
+    # signal de synthèse fourni par blocs : dent de scie de fréquence glissant
+    # de 200 à 400 Hz, bruitée, pendant 10 minutes à 48 kHz
+    import Signaux_Periodiques
+    fe,duree=48000,600.
+    def blocs(taille=fe):
+        rng=np.random.default_rng(0)
+        phase=0.
+        for debut in range(0,int(duree*fe),taille):
+            t=(debut+np.arange(taille))/fe
+            f=200+200*t/duree
+            ph=phase+np.cumsum(f)/fe
+            phase=ph[-1]
+            yield Signaux_Periodiques.scie(ph)+0.1*rng.standard_normal(taille)
+
+    t0=time.time()
+    spectrogramme,t,f0,harmoniques=analyse_longue(blocs(),fe,K=5)
+    print('%.0f s de signal analysées en %.1f s' % (duree,time.time()-t0))
+    instants,P=spectrogramme.resultat()
+    fig,(ax1,ax2)=plt.subplots(2,1,sharex=True)
+    ax1.imshow(10*np.log10(P.T+1e-20),origin='lower',aspect='auto',cmap='inferno',
+               extent=[instants[0],instants[-1],0,fe/2])
+    ax1.set_ylim(0,3000)
+    ax1.set_ylabel('fréquence (Hz)')
+    ax2.plot(t,f0)
+    ax2.set_xlabel('temps (s)')
+    ax2.set_ylabel('fondamental (Hz)')
+    plt.show()
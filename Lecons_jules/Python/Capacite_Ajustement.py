@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Ajustement des températures de Debye et d'Einstein sur des capacités
+thermiques mesurées, pour un grand nombre de matériaux à la fois.
+
+Chaque matériau est décrit par un fichier CSV <nom>.csv d'un même dossier,
+à deux colonnes : température (K) et capacité thermique molaire (J/mol/K),
+une éventuelle ligne d'en-tête et des commentaires commençant par #.
+
+Pour chaque matériau on ajuste theta_D (modèle de Debye, x=T/theta_D) et
+theta_E (modèle d'Einstein de Capacité_Calorifique, x=2T/theta_E) par
+moindres carrés, avec des résidus vectorisés sur toutes les températures et
+les dérivées analytiques des modèles par rapport à theta. L'amplitude
+3*n*R (loi de Dulong et Petit) est fixée, ou ajustée si amplitude_libre.
+Les matériaux sont répartis entre plusieurs processus.
+
+Exemple : resultats=ajuste_dossier('mesures')
+Executer ce fichier ajuste des données synthétiques à titre de démonstration.
+"""
+import os
+import glob
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.optimize import least_squares
+
+from Capacité_Calorifique import Einstein, Debye, tables
+
+R=8.314462618   # constante des gaz parfaits (J/mol/K)
+
+def _fonc_stable(t):
+    '''fonc du modèle de Debye, t^4 e^t/(e^t-1)², sans débordement à grand t'''
+    e=np.exp(-t)
+    return t**4*e/(1-e)**2
+
+def derivee_Debye(x):
+    '''dérivée par rapport à x du modèle de Debye 3x³ I(1/x)'''
+    return 3*Debye(x)/x-3*x*_fonc_stable(1/x)
+
+def derivee_Einstein(x):
+    '''dérivée par rapport à x du modèle d'Einstein (y/sinh y)², y=1/x'''
+    y=1/x
+    return Einstein(x)*2*y*(y/np.tanh(y)-1)
+
+# pour chaque modèle : fonction, dérivée et facteur c tel que x=c*T/theta
+MODELES={'Debye':(Debye,derivee_Debye,1.),
+         'Einstein':(Einstein,derivee_Einstein,2.)}
+
+def lit_mesures(fichier):
+    '''températures et capacités thermiques lues dans un fichier CSV'''
+    donnees=np.genfromtxt(fichier,delimiter=',',comments='#')
+    donnees=donnees[~np.isnan(donnees).any(axis=1)]
+    return donnees[:,0],donnees[:,1]
+
+def ajuste(T,C,modele='Debye',n_atomes=1,amplitude_libre=False):
+    '''ajuste theta (et l'amplitude si amplitude_libre) du modèle sur C(T).
+    Renvoie (theta, amplitude, écart quadratique moyen).'''
+    f,df,c=MODELES[modele]
+    A0=3*n_atomes*R
+    # point de départ : meilleur theta d'une grille, évaluée en une seule fois
+    grille=np.geomspace(5,5000,200)
+    ecarts=np.sum((A0*f(c*T[:,None]/grille)-C[:,None])**2,axis=0)
+    theta0=grille[np.argmin(ecarts)]
+
+    def residus(p):
+        theta=p[0]
+        A=p[1] if amplitude_libre else A0
+        return A*f(c*T/theta)-C
+
+    def jacobien(p):
+        theta=p[0]
+        A=p[1] if amplitude_libre else A0
+        x=c*T/theta
+        J=[-A*df(x)*x/theta]
+        if amplitude_libre:
+            J.append(f(x))
+        return np.array(J).T
+
+    p0=[theta0,A0] if amplitude_libre else [theta0]
+    sol=least_squares(residus,p0,jac=jacobien,bounds=(0,np.inf),x_scale='jac')
+    A=sol.x[1] if amplitude_libre else A0
+    return sol.x[0],A,np.sqrt(np.mean(sol.fun**2))
+
+def ajuste_fichier(fichier,n_atomes=1,amplitude_libre=False):
+    '''ajustement des deux modèles pour un matériau'''
+    T,C=lit_mesures(fichier)
+    resultat={'materiau':os.path.splitext(os.path.basename(fichier))[0]}
+    for modele in MODELES:
+        theta,A,ecart=ajuste(T,C,modele,n_atomes,amplitude_libre)
+        resultat['theta_'+modele[0]]=theta
+        resultat['A_'+modele[0]]=A
+        resultat['ecart_'+modele[0]]=ecart
+    return resultat
+
+def ajuste_dossier(dossier,n_atomes=1,amplitude_libre=False,processus=None):
+    '''ajuste tous les fichiers CSV du dossier, répartis entre processus
+    (par défaut autant que de coeurs). Renvoie la liste des résultats.'''
+    fichiers=sorted(glob.glob(os.path.join(dossier,'*.csv')))
+    # les tables de Capacité_Calorifique sont construites ici, une seule fois,
+    # avant que les processus ne les relisent
+    tables()
+    taille=max(1,len(fichiers)//(4*(processus or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(processus) as executeur:
+        return list(executeur.map(ajuste_fichier,fichiers,[n_atomes]*len(fichiers),
+                                  [amplitude_libre]*len(fichiers),chunksize=taille))
+
+def ecrit_resultats(resultats,fichier):
+    '''enregistre les résultats dans un fichier CSV'''
+    colonnes=list(resultats[0])
+    with open(fichier,'w') as sortie:
+        sortie.write(','.join(colonnes)+'\n')
+        for r in resultats:
+            sortie.write(','.join(str(r[c]) for c in colonnes)+'\n')
+
+if __name__=='__main__':
+    # données synthétiques : modèle de Debye bruité pour 200 matériaux
+    rng=np.random.default_rng(0)
+    dossier=tempfile.mkdtemp()
+    thetas=rng.uniform(100,600,200)
+    for k,theta in enumerate(thetas):
+        T=np.linspace(5,400,80)
+        C=3*R*Debye(T/theta)*(1+0.01*rng.standard_normal(len(T)))
+        np.savetxt(os.path.join(dossier,'materiau_%03d.csv' % k),np.c_[T,C],
+                   delimiter=',',header='T (K),C (J/mol/K)')
+    resultats=ajuste_dossier(dossier)
+    ecrit_resultats(resultats,os.path.join(dossier,'resultats.csv'))
+    theta_D=np.array([r['theta_D'] for r in resultats])
+    print('écart relatif maximal sur theta_D : %.2g' % np.max(np.abs(theta_D/thetas-1)))
+
+    T,C=lit_mesures(os.path.join(dossier,'materiau_000.csv'))
+    r=resultats[0]
+    plt.plot(T,C,'k.',label='mesures')
+    plt.plot(T,r['A_D']*Debye(T/r['theta_D']),'r',label=r'Debye, $\theta_D$=%.0f K' % r['theta_D'])
+    plt.plot(T,r['A_E']*Einstein(2*T/r['theta_E']),'b',label=r'Einstein, $\theta_E$=%.0f K' % r['theta_E'])
+    plt.grid()
+    plt.xlabel('Température (K)')
+    plt.ylabel('Capacité thermique (J/mol/K)')
+    plt.legend()
+    plt.show()
@@ -4,13 +4,17 @@ Created on Fri May 25 20:35:17 2018
 
 @author: User
 """
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 
 
-def Einstein(x):
-    '''capacité calorifique (normalisée par 3kB) decrite par le modele d'Einstein'''
-    return 1/(x*np.sinh(1/x))**2
+def Einstein_direct(x):
+    '''capacité calorifique (normalisée par 3kB) decrite par le modele d'Einstein,
+    1/(x sinh(1/x))² écrit sous une forme qui ne déborde pas à basse température'''
+    y=1/np.asarray(x,dtype=float)
+    e=np.exp(-2*y)
+    return (2*y*np.sqrt(e)/(1-e))**2
 
 #capacité calorifique(normalisée par 3kB) décrite par un modèle classique
 #loi de Dulong et Petit
@@ -32,26 +36,150 @@ def fonc(t):
     '''fonction intégré dans le modele de Debye'''
     return t**4*np.exp(t)/(np.exp(t)-1)**2
 
+def derivee_fonc(t):
+    '''dérivée de fonc, à partir de sa dérivée logarithmique 4/t-coth(t/2)'''
+    return fonc(t)*(4/t-1/np.tanh(t/2))
+
+#L'intégrale de fonc est calculée une seule fois, de façon cumulée, sur une
+#grille commune [0,T_MAX] de pas H ; au-delà de T_MAX, fonc(t)<1e-18 et
+#l'intégrale a atteint sa limite 4pi^4/15.
+H=1e-2
+T_MAX=60.
+
+def integrale_cumulee(h=H,t_max=T_MAX):
+    '''intégrale de fonc entre 0 et chaque point de la grille : méthode des
+    trapèzes cumulée, avec la correction d'Euler-Maclaurin -h²/12 (f'(t)-f'(0))
+    qui rend la méthode d'ordre 4'''
+    t=np.linspace(0,t_max,int(round(t_max/h))+1)
+    f=np.zeros_like(t)
+    df=np.zeros_like(t)          # fonc(t)~t² et fonc'(t)~2t en 0
+    f[1:]=fonc(t[1:])
+    df[1:]=derivee_fonc(t[1:])
+    I=np.concatenate([[0],np.cumsum(f[1:]+f[:-1])*h/2])-h**2/12*df
+    return t,f,I
+
+_t,_f,_I=integrale_cumulee()
+U_SERIE=0.5
+
+def integrale_debye(u):
+    '''intégrale de fonc entre 0 et u (u scalaire ou tableau quelconque),
+    par interpolation d'Hermite cubique de l'intégrale cumulée, dont la
+    dérivée fonc est connue aux noeuds. Erreur absolue inférieure à
+    (T_MAX/720+1/384)*H**4*max|fonc^(4)|, soit moins de 1e-10 pour H=1e-2.
+    Pour u<U_SERIE (hautes températures), où cette erreur absolue serait
+    trop grande devant l'intégrale (~u³/3), on utilise le développement
+    u³/3-u^5/60+u^7/1680-u^9/54432+u^11/1900800, d'erreur relative
+    inférieure à 1e-10.'''
+    u=np.asarray(u,dtype=float)
+    uc=np.clip(u,0,T_MAX)
+    i=np.minimum((uc/H).astype(int),len(_t)-2)
+    s=(uc-_t[i])/H
+    h00=(1+2*s)*(1-s)**2
+    h10=s*(1-s)**2
+    h01=s**2*(3-2*s)
+    h11=s**2*(s-1)
+    interpolation=h00*_I[i]+H*h10*_f[i]+h01*_I[i+1]+H*h11*_f[i+1]
+    u2=uc**2
+    serie=uc**3*(1/3-u2*(1/60-u2*(1/1680-u2*(1/54432-u2/1900800))))
+    return np.where(uc<U_SERIE,serie,interpolation)
+
+def Debye_direct(x):
+    '''capacité calorifique (normalisée par 3kB) decrite par le modele de Debye
+    (x scalaire ou tableau), à une erreur relative inférieure à 1e-8 près'''
+    x=np.asarray(x,dtype=float)
+    return 3*x**3*integrale_debye(1/x)
+
+#Tables précalculées des modèles d'Einstein et de Debye, sur une grille
+#uniforme en ln(x) entre X_MIN et X_MAX, enregistrées dans FICHIER_TABLES et
+#relues aux exécutions suivantes. En dehors de cet intervalle on utilise les
+#développements asymptotiques, exacts à mieux que 1e-9 près :
+# - basses températures : loi en T³ de Debye, 4y²exp(-2y) pour Einstein (y=1/x)
+# - hautes températures : 1-1/(20x²)+1/(560x^4) et 1-1/(3x²)+1/(15x^4)
+X_MIN=0.02
+X_MAX=20.
+TOLERANCE=1e-7
+FICHIER_TABLES=os.path.join(os.path.dirname(os.path.abspath(__file__)),'Capacite_Calorifique_tables.npz')
+
+class Table:
+    '''fonction positive tabulée : ln(f) est tabulé sur une grille uniforme en
+    u=ln(x) et interpolé par des polynômes de Lagrange de degré 3, ce qui
+    donne une erreur relative uniforme et une évaluation en O(1) par point'''
+    def __init__(self,valeurs,x_min=X_MIN,x_max=X_MAX):
+        self.valeurs=np.asarray(valeurs)
+        self.ln_valeurs=np.log(self.valeurs)
+        self.u_min=np.log(x_min)
+        self.du=(np.log(x_max)-self.u_min)/(len(valeurs)-1)
+
+    def __call__(self,x):
+        v=(np.log(x)-self.u_min)/self.du
+        i=np.clip(np.floor(v).astype(int),1,len(self.valeurs)-3)
+        s=v-i
+        f=self.ln_valeurs
+        return np.exp(-s*(s-1)*(s-2)/6*f[i-1]+(s+1)*(s-1)*(s-2)/2*f[i]
+                      -(s+1)*s*(s-2)/2*f[i+1]+(s+1)*s*(s-1)/6*f[i+2])
+
+def construit_table(f,tol=TOLERANCE,x_min=X_MIN,x_max=X_MAX):
+    '''tabule f en doublant le nombre de points jusqu'à ce que l'erreur
+    relative d'interpolation, mesurée aux milieux des intervalles, soit
+    inférieure à tol'''
+    n=64
+    while True:
+        table=Table(f(np.geomspace(x_min,x_max,n+1)),x_min,x_max)
+        milieux=np.exp(table.u_min+(np.arange(n)+0.5)*table.du)
+        if np.max(np.abs(table(milieux)/f(milieux)-1))<tol:
+            return table
+        n*=2
+
+_tables={}
+
+def tables(tol=TOLERANCE,fichier=FICHIER_TABLES):
+    '''tables d'Einstein et de Debye : relues dans fichier si elles y ont
+    été enregistrées avec une tolérance au moins aussi fine, construites et
+    enregistrées (si possible) sinon'''
+    if not _tables or _tables['tol']>tol:
+        try:
+            donnees=np.load(fichier)
+            if donnees['tol']>tol or donnees['x_min']!=X_MIN or donnees['x_max']!=X_MAX:
+                raise ValueError('table trop grossiere')
+            _tables.update(tol=float(donnees['tol']),Einstein=Table(donnees['Einstein']),
+                           Debye=Table(donnees['Debye']))
+        except (OSError,KeyError,ValueError):
+            E=construit_table(Einstein_direct,tol)
+            D=construit_table(Debye_direct,tol)
+            try:
+                np.savez(fichier,tol=tol,x_min=X_MIN,x_max=X_MAX,Einstein=E.valeurs,Debye=D.valeurs)
+            except OSError:
+                pass        # répertoire en lecture seule : tables gardées en mémoire
+            _tables.update(tol=tol,Einstein=E,Debye=D)
+    return _tables
+
+def Einstein(x):
+    '''capacité calorifique (normalisée par 3kB) decrite par le modele d'Einstein'''
+    x=np.asarray(x,dtype=float)
+    xc=np.clip(x,X_MIN,X_MAX)
+    y2=1/x**2
+    return np.where(x<X_MIN,4*y2*np.exp(-2/x),
+           np.where(x>X_MAX,1-y2*(1/3-y2/15),tables()['Einstein'](xc)))
+
 def Debye(x):
     '''capacité calorifique (normalisée par 3kB) decrite par le modele de Debye'''
-    n=1000
-    return 3*x**3*integration(fonc,1e-9,1/x,n)
-
-x=np.linspace(1e-5,4,1000)
-y1=[]
-y2=[]
-y3=[]
-for k in range(len(x)):
-    y1.append(Dulong(x[k]))
-    y2.append(Einstein(x[k]))
-    y3.append(Debye(x[k]))
-
-
-plt.plot(x,y1,'g',label="Dulong-Petit")
-plt.plot(x,y2,'b',label="Einstein")
-plt.plot(x,y3,'r',label="Debye")
-plt.grid()
-plt.xlabel('Température réduite')
-plt.ylabel('Capacité thermique /3kB' )
-plt.legend()
-plt.show()
\ No newline at end of file
+    x=np.asarray(x,dtype=float)
+    xc=np.clip(x,X_MIN,X_MAX)
+    y2=1/x**2
+    return np.where(x<X_MIN,4*np.pi**4/5*x**3,
+           np.where(x>X_MAX,1-y2*(1/20-y2/560),tables()['Debye'](xc)))
+
+if __name__=='__main__':
+    x=np.linspace(1e-5,4,1000)
+    y1=np.full_like(x,Dulong(x))
+    y2=Einstein(x)
+    y3=Debye(x)
+
+    plt.plot(x,y1,'g',label="Dulong-Petit")
+    plt.plot(x,y2,'b',label="Einstein")
+    plt.plot(x,y3,'r',label="Debye")
+    plt.grid()
+    plt.xlabel('Température réduite')
+    plt.ylabel('Capacité thermique /3kB' )
+    plt.legend()
+    plt.show()
\ No newline at end of file
@@ -0,0 +1,183 @@
+#Code calculant la reflexion et la transmission d'un empilement de couches
+#minces (miroirs de Bragg, traitements antireflet, cavites Fabry-Perot a
+#miroirs dielectriques) par la methode des matrices caracteristiques.
+#
+#Un empilement est une liste d'elements, chacun etant :
+# - soit une couche (n,d) d'indice n et d'epaisseur d (m) ; un milieu absorbant
+#   a un indice complexe n'+i*n'' avec n''>0 (convention exp(i(kz-wt))),
+# - soit un sous-empilement repete (liste,p), par exemple ([(nH,dH),(nL,dL)],20).
+#Les sous-empilements repetes sont calcules par exponentiation rapide
+#(log2(p) produits de matrices au lieu de p).
+#
+#reflexion_transmission(empilement,lambdas,angles) renvoie R et T sur toute
+#la grille longueur d'onde x angle d'incidence : chaque produit de matrices
+#2x2 est effectue en une seule operation sur tous les points de la grille.
+#Les grandeurs qui ne dependent que de l'angle (refraction, admittance) sont
+#calculees une seule fois par couche. Sur la grille de la demonstration
+#(1000 longueurs d'onde x 400 angles), un miroir de Bragg de 100 couches
+#(sous-empilement repete) prend moins d'un dixieme de seconde ; la seconde
+#n'est tenue que de justesse pour 100 couches toutes differentes (0.8 a 1 s
+#sur un coeur), le cout etant alors proportionnel au nombre de couches.
+#Executer ce fichier pour tracer la carte R(lambda,theta) d'un miroir de
+#Bragg de 100 couches et la reflexion d'un traitement antireflet.
+
+from matplotlib import pyplot as plt
+import numpy as np
+
+def couche_quart_onde(n,lambda_c):
+    '''couche (n,d) d'epaisseur optique lambda_c/4'''
+    return (n,lambda_c/(4*n))
+
+def miroir_bragg(nH,nL,lambda_c,p):
+    '''empilement de p periodes haut/bas indice quart d'onde a lambda_c'''
+    return [([couche_quart_onde(nH,lambda_c),couche_quart_onde(nL,lambda_c)],p)]
+
+def _cos_refraction(n,n0sin):
+    '''cosinus de l'angle de refraction dans un milieu d'indice n (loi de
+    Snell-Descartes), choisi de partie imaginaire positive (onde evanescente)'''
+    c=np.sqrt(1-(n0sin/n)**2+0j)
+    return np.where(c.imag<0,-c,c)
+
+def _admittance(n,c,polarisation):
+    return n*c if polarisation=='s' else n/c
+
+#Une matrice caracteristique [[m11,m12],[m21,m22]] est stockee sous la forme
+#(m11,i*m12,i*m21,m22) : pour une couche transparente ces quatre coefficients
+#sont reels (cos(delta), sin(delta)/eta, eta*sin(delta), cos(delta)) et les
+#produits se font alors en arithmetique reelle.
+_IDENTITE=(1.,0.,0.,1.)
+
+def _produit(M,N):
+    '''produit de deux matrices caracteristiques, chaque coefficient etant
+    un tableau sur la grille'''
+    a,b,c,d=M
+    e,f,g,h=N
+    return (a*e-b*g,a*f+b*h,c*e+d*g,d*h-c*f)
+
+def _puissance(M,p):
+    '''M**p par exponentiation rapide'''
+    R=_IDENTITE
+    while p>0:
+        if p&1:
+            R=M if R is _IDENTITE else _produit(R,M)
+        p>>=1
+        if p:
+            M=_produit(M,M)
+    return R
+
+def _grandeurs_angulaires(n,d,n0sin,polarisation):
+    '''grandeurs d'une couche qui ne dependent que de l'angle : demi-dephasage
+    par unite de k0, admittance et son inverse, couche transparente ou non'''
+    c=_cos_refraction(n,n0sin)
+    eta=_admittance(n,c,polarisation)
+    demi_phase=n*d*c/2
+    transparente=np.isrealobj(n) and np.all(c.imag==0)
+    if transparente:
+        demi_phase,eta=demi_phase.real,eta.real
+    return demi_phase,eta,1/eta,transparente
+
+def _matrice_couche(k0,demi_phase,eta,inv_eta,transparente):
+    if transparente:
+        # couche transparente en propagation : coefficients reels, obtenus
+        # par les formules de l'arc moitie (une seule tangente, bien plus
+        # rapide que cos et sin ; tan(delta/2) reste fini pour delta flottant)
+        t=np.tan(k0*demi_phase)
+        u=t*t
+        u+=1
+        np.divide(2,u,out=u)        # 2cos^2(delta/2)=1+cos(delta)
+        cd=u-1
+        u*=t                        # sin(delta)
+        return (cd,u*inv_eta,eta*u,cd)
+    delta=2*k0*demi_phase
+    cd,sd=np.cos(delta),np.sin(delta)
+    return (cd,sd*inv_eta,eta*sd,cd)
+
+def _matrice(empilement,k0,n0sin,polarisation,memo=None,angulaire=None):
+    '''matrice caracteristique de l'empilement ; les couches identiques
+    (meme n et meme d) ne sont calculees qu'une fois grace a memo, et leurs
+    grandeurs angulaires une fois pour tous les blocs grace a angulaire'''
+    if memo is None:
+        memo={}
+    if angulaire is None:
+        angulaire={}
+    M=_IDENTITE
+    for element in empilement:
+        if isinstance(element[0],(list,tuple)):
+            sous_empilement,p=element
+            Mi=_puissance(_matrice(sous_empilement,k0,n0sin,polarisation,memo,angulaire),p)
+        else:
+            if element not in memo:
+                if element not in angulaire:
+                    angulaire[element]=_grandeurs_angulaires(*element,n0sin,polarisation)
+                memo[element]=_matrice_couche(k0,*angulaire[element])
+            Mi=memo[element]
+        M=Mi if M is _IDENTITE else _produit(M,Mi)
+    return M
+
+#Nombre de points de la grille traites a la fois : les tableaux de travail
+#restent dans le cache du processeur, ce qui accelere nettement les produits.
+TAILLE_BLOC=16384
+
+def reflexion_transmission(empilement,lambdas,angles=0.,n0=1.,ns=1.52,polarisation='s',
+                           taille_bloc=TAILLE_BLOC):
+    '''coefficients de reflexion R et de transmission T (en energie) de
+    l'empilement depose sur un substrat d'indice ns, eclaire depuis un milieu
+    d'indice n0 ; polarisation 's' (TE) ou 'p' (TM), angles en radians.
+    R et T ont la forme (len(lambdas),len(angles)).'''
+    lambdas=np.ravel(lambdas)
+    angles=np.ravel(angles)
+    n0sin=n0*np.sin(angles)
+    eta0=_admittance(n0,_cos_refraction(n0,n0sin),polarisation)
+    etas=_admittance(ns,_cos_refraction(ns,n0sin),polarisation)
+    R=np.empty((len(lambdas),len(angles)))
+    T=np.empty_like(R)
+    pas=max(1,taille_bloc//len(angles))
+    angulaire={}
+    for debut in range(0,len(lambdas),pas):
+        k0=2*np.pi/lambdas[debut:debut+pas,None]
+        a,b,c,d=_matrice(empilement,k0,n0sin,polarisation,angulaire=angulaire)
+        B=a-1j*b*etas
+        C=d*etas-1j*c
+        denominateur=eta0*B+C
+        R[debut:debut+pas]=np.abs((eta0*B-C)/denominateur)**2
+        T[debut:debut+pas]=4*eta0.real*etas.real/np.abs(denominateur)**2
+    return R,T
+
+def carte(empilement,lambdas,angles,titre='',**kwargs):
+    '''carte de couleur de R en fonction de la longueur d'onde et de l'angle'''
+    R,T=reflexion_transmission(empilement,lambdas,angles,**kwargs)
+    plt.figure()
+    plt.title(titre)
+    plt.imshow(R,origin='lower',aspect='auto',cmap='inferno',vmin=0,vmax=1,
+               extent=[np.degrees(angles[0]),np.degrees(angles[-1]),
+                       lambdas[0]*1e9,lambdas[-1]*1e9])
+    plt.colorbar(label='R')
+    plt.xlabel('angle d\'incidence (degres)')
+    plt.ylabel(r'$\lambda$ (nm)')
+    plt.show()
+    return R,T
+
+if __name__=='__main__':
+    lambdas=np.linspace(400e-9,900e-9,1000)
+    angles=np.radians(np.linspace(0,80,400))
+
+    #Miroir de Bragg TiO2/SiO2 de 50 periodes (100 couches) centre a 600 nm
+    carte(miroir_bragg(2.35,1.46,600e-9,50),lambdas,angles,
+          titre='Miroir de Bragg (100 couches), polarisation s')
+
+    #Traitement antireflet quart d'onde MgF2 sur verre et cavite Fabry-Perot
+    #entre deux miroirs de Bragg
+    plt.figure()
+    plt.title('Reflexion en incidence normale')
+    R,T=reflexion_transmission([couche_quart_onde(1.38,550e-9)],lambdas)
+    plt.plot(lambdas*1e9,R[:,0],label='antireflet MgF2')
+    R,T=reflexion_transmission([],lambdas)
+    plt.plot(lambdas*1e9,R[:,0],'--',label='verre nu')
+    cavite=miroir_bragg(2.35,1.46,600e-9,6)+[(1.46,3e-6)]+miroir_bragg(1.46,2.35,600e-9,6)
+    R,T=reflexion_transmission(cavite,lambdas)
+    plt.plot(lambdas*1e9,T[:,0],label='cavite : transmission')
+    plt.xlabel(r'$\lambda$ (nm)')
+    plt.ylabel('R, T')
+    plt.ylim([0,1])
+    plt.legend(loc=1)
+    plt.show()
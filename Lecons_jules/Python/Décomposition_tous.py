@@ -11,6 +11,11 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Slider, Button, RadioButtons, CheckButtons
 
+import Signaux_Periodiques
+import Analyse_Spectrale
+import Lecture_Signaux
+import Synthese_Audio
+
 
 # Paramètres modifiables
 
@@ -18,39 +23,47 @@ from matplotlib.widgets import Slider, Button, RadioButtons, CheckButtons
 
 max_harm = 40
 
-# Bibliothèque de fonctions
+# Bibliothèque de fonctions (t en fraction de période)
 
-@np.vectorize
 def triangle(t) :
-    return -0.25+t if t<0.5 else 0.75-t
+    return Signaux_Periodiques.triangle(t, bas=-0.25, haut=0.25)
 
-@np.vectorize
 def scie(t) :
-    return -0.25+t if t<0.75 else t-1.25
+    return Signaux_Periodiques.scie(t, bas=-0.5, haut=0.5, retard=-0.25)
 
-@np.vectorize
 def creneau(t) :
-    return -0.5 + (1.0 if 0.1<=t<0.6 else 0.0)
+    return Signaux_Periodiques.creneau(t, bas=-0.5, haut=0.5, retard=0.1)
 
-@np.vectorize
 def bruitblanc(t) :
-    np.random.seed(int(t*1000000))
-    return np.random.random()-0.5
+    return Signaux_Periodiques.bruit_blanc(np.size(t), graine=0, amplitude=0.5)
 
 # Choix de la fonction
 
 foo = triangle
 
+# ... ou d'un signal enregistré (fichier WAV, CSV ou binaire d'oscilloscope,
+# voir Lecture_Signaux) : une période à partir de l'instant debut (s), de
+# durée periode (s), détectée par autocorrélation si periode vaut None
+
+fichier = None
+debut = 0.0
+periode = None
+options = {}    # ex. {'fe': 1e6, 'dtype': np.int16} pour un fichier binaire
+
+# Spectrogramme de tout l'enregistrement (calculé en flux, cf. Analyse_Spectrale)
+
+spectrogramme = False
+
 #-----------------------------------------------------------------------
 
 # Bibliothèques utilisées
 
 import numpy as np
-import numpy.fft as fft
 import matplotlib
 import matplotlib.pyplot as plt
 import matplotlib.animation as ani
 import matplotlib.widgets as mwg
+from matplotlib.collections import PolyCollection
 
 #-----------------------------------------------------------------------
 
@@ -59,23 +72,31 @@ import matplotlib.widgets as mwg
 if '__iep__' not in globals() :
     matplotlib.interactive(False)
 
-# Calcul du spectre
+# Calcul du spectre (N échantillons sur une période, jusqu'à 2**20 et plus)
 
 N = 8192
-T = np.linspace(0.0, 1.0, N)
-Y = foo(T)
-Yp = fft.fft(Y)
-
-# Tracés
-
-Tr = np.linspace(0.0, 2.0, 2*N)
-Ampl = 20*np.log10(np.abs(Yp[:max_harm]))
+T = np.arange(N)/N
+if fichier is None :
+    Y = foo(T)
+else :
+    fe, x = Lecture_Signaux.charge(fichier, **options)
+    Y = Lecture_Signaux.une_periode(x, fe, N, debut, periode)
+spectre = Analyse_Spectrale.Reconstruction(Y)
+Yp = spectre.spectre
+
+# Tracés : au plus 4096 points par période, les sommes partielles ne
+# contenant que max_harm harmoniques
+
+pas = max(1, N//4096)
+Tr = np.concatenate([T[::pas], T[::pas]+1])
+# amplitudes en dB, ramenées à 0 dB au moins (pas de -inf pour une harmonique nulle)
+Ampl = 20*np.log10(np.maximum(np.abs(Yp[:max_harm]), 1))
 
 # Signal
 
 axTmp = plt.axes([0.11, 0.6, 0.78, 0.32])
-axTmp.plot(Tr, np.concatenate([Y, Y]), "k--")
-partial, = axTmp.plot(Tr, np.concatenate([Y, Y]), "b")
+axTmp.plot(Tr, np.tile(Y[::pas], 2), "k--")
+partial, = axTmp.plot(Tr, np.tile(Y[::pas], 2), "b")
 axTmp.set_xlim([0, 2])
 axTmp.set_ylim([ min(Y) - (max(Y)-min(Y))*0.3, max(Y) + (max(Y)-min(Y))*0.3 ])
 axTmp.set_title("signal")
@@ -86,7 +107,11 @@ axTmp.set_xlabel("temps (t/T0)")
 
 axTmp = plt.axes([0.11, 0.15, 0.78, 0.32])
 axTmp.bar(np.arange(max_harm)-0.5, Ampl, color="white")
-rects = axTmp.bar(np.arange(max_harm)-0.5, Ampl, color="blue")
+# barres regroupées en une seule collection, pour changer toutes les hauteurs d'un coup
+sommets = np.zeros((max_harm, 4, 2))
+sommets[:, :, 0] = (np.arange(max_harm)-0.5)[:, None] + [-0.4, -0.4, 0.4, 0.4]
+barres = PolyCollection(sommets, facecolors="blue")
+axTmp.add_collection(barres)
 axTmp.set_xlim([0, max_harm])
 axTmp.set_ylim([0, np.max(Ampl)*1.1])
 axTmp.set_title("spectre")
@@ -99,15 +124,45 @@ axTmp = plt.axes([0.11, 0.035, 0.78, 0.035])
 slider = mwg.Slider(axTmp, '', valmin=0, valmax=max_harm, valinit=max_harm)
 
 def Update(i) :
-    PartialY = np.real(fft.ifft(Yp * np.fromfunction(lambda j : j<=i, (len(Yp),))))
-    partial.set_data(Tr, 2*np.concatenate([PartialY, PartialY]))
-    for j, rect in enumerate(rects) :
-        rect.set_height(0 if j>i else Ampl[j])
+    PartialY = spectre.regle(math.floor(i))
+    partial.set_data(Tr, np.tile(PartialY[::pas], 2))
+    sommets[:, 1:3, 1] = np.where(np.arange(max_harm)>i, 0, Ampl)[:, None]
+    barres.set_verts(sommets)
 
 slider.on_changed(Update)
 
+# Bouton : enregistre 2 s de la somme partielle courante, jouée à 220 Hz,
+# dans Decomposition_tous.wav
+
+a = 2*Yp[:max_harm+1].real/N
+b = -2*Yp[:max_harm+1].imag/N
+a[0] /= 2
+synthetiseur = Synthese_Audio.Synthetiseur(a, b, f0=220.0, volume=0.5/max(np.max(np.abs(Y)), 1e-12))
+
+def Son(event) :
+    synthetiseur.regle(math.floor(slider.val), immediat=True)
+    Synthese_Audio.ecrit_wav(synthetiseur, "Decomposition_tous.wav", 2.0)
+
+axSon = plt.axes([0.01, 0.035, 0.08, 0.035])
+bouton = mwg.Button(axSon, 'son')
+bouton.on_clicked(Son)
+
 Update(max_harm)
 
+# Spectrogramme
+
+if fichier is not None and spectrogramme :
+    instants, P = Analyse_Spectrale.analyse_longue(x, fe).resultat()
+    if len(instants) == 0 :
+        print("spectrogramme : enregistrement plus court qu'une trame (4096 points)")
+    else :
+        plt.figure()
+        plt.imshow(10*np.log10(P.T+1e-20), origin="lower", aspect="auto", cmap="inferno",
+                   extent=[instants[0], instants[-1], 0, fe/2])
+        plt.title("spectrogramme")
+        plt.xlabel("temps (s)")
+        plt.ylabel("fréquence (Hz)")
+
 # Détection utilisation hors Pyzo
 
 if '__iep__' not in globals() :
@@ -9,9 +9,13 @@ Created on Sun Apr 29 15:05:37 2018
 ## Importation des bibliotheques
 import numpy as np
 import matplotlib.pyplot as plt
-from matplotlib.widgets import Slider, Button
+from matplotlib.widgets import Slider, Button, RadioButtons
 from numpy import pi
 
+import Signaux_Periodiques
+import Synthese_Audio
+from Series_Fourier import SommesPartielles, coefficients_affines, reconstruction, NOYAUX
+
 plt.close("all")
 ## Construction manuelle du signal triangle et creation de la fenetre
 
@@ -24,28 +28,26 @@ plt.subplots_adjust(left=0.2, bottom=0.2)         # dimensions du graphique
 
 # definition de la fonction triangle
 def triangle(x):
-    a = x % (T0)
-    if a < T0/2:
-        return a/(T0/2)
-    else:
-        return (2-a/(T0/2))
-
-creneau_vec = np.vectorize(triangle)
+    return Signaux_Periodiques.triangle(x, T0)
 
 t = np.arange(-2*T0, 2*T0, 0.001)    # temps allant de -2 s à 4s par pas de 0.01s (sur trois periodes)
-plt.plot(t,creneau_vec(t),'b')
+plt.plot(t,triangle(t),'b')
 
 # Creation de la courbe initiale (avec la serie de Fourier à un terme)
+def terme(n,x):
+    return -(8*0.5/pi**2)*(np.cos((2*n+1)*2*pi*x/T0))/(2*n+1)**2      # harmonique de rang 2n+1
+
 def f0(x,N):
     S0 = 0.5
     for n in np.arange(0,N+1,1):                        # n va varier de 0 à N0 par pas de 1 (attention la borne max est N0+1 car il exclu la borne max
-        Cn0 = -(8*0.5/pi**2)*(np.cos((2*n+1)*2*pi*x/T0))/(2*n+1)**2
-        S0 = S0 + Cn0
+        S0 = S0 + terme(n,x)
     return S0
 
+serie = SommesPartielles(terme,t,base=0.5)              # sommes partielles sur t, gardees en memoire pour le curseur
+
 
 N0=0                                                # initialisation à 1 le nombre de composantes de la serie de Fourier
-l, = plt.plot(t, f0(t,N0), lw=1, color='red')         # courbe à tracer i en fonction de omega
+l, = plt.plot(t, serie(N0), lw=1, color='red')         # courbe à tracer i en fonction de omega
 plt.axis([-2*T0, 2*T0, -0.5, 1.5*a0])                     # limite des axes (xmin,xmax,ymin,ymax)
 plt.xlabel("temps (s)")                     # titre de l'axe des abscisses
 plt.ylabel("Amplitude du signal (V)")                               # titre de l'axe des ordonnees
@@ -58,12 +60,25 @@ axcolor = 'lightgoldenrodyellow'                            # couleur des barres
 axN = plt.axes([0.25, 0.02, 0.65, 0.03])    # localisation de la barre pour N
 ioN = Slider(axN,"nbre d'harmoniques",0,6,valinit=N0,valfmt='%0.0f')
 
+## Choix du noyau de sommation (Dirichlet : somme partielle ordinaire)
+axnoyau = plt.axes([0.01, 0.45, 0.15, 0.2])
+ioNoyau = RadioButtons(axnoyau, list(NOYAUX))
+an, bn = coefficients_affines([(0,0),(T0/2,1)], 2*6+1, T=T0)      # coefficients exacts du signal
+M = round(T0/0.001)                                     # nombre de points de t par periode
+
+def somme(N):
+    if ioNoyau.value_selected == 'Dirichlet':
+        return serie(N)
+    # somme ponderee jusqu'a l'harmonique 2N+1, sur une periode, recopiee sur toute la grille t
+    return np.resize(reconstruction(an, bn, 2*N+1, ioNoyau.value_selected, M), len(t))
+
 ## Definition de la fonction qui permet de reinitialiser les valeurs initiales par celle choisie à la barre
 def update(val):
     N = ioN.val                                             # prend la valeur de la barre pour N
-    l.set_ydata(f0(t,N))    # ressort le nouveau profil de resonance
+    l.set_ydata(somme(round(N)))    # ressort le nouveau profil de resonance
     fig.canvas.draw_idle()                                  # redessine la courbe
 ioN.on_changed(update)                                      # affiche à côte de la barre la valeur de N
+ioNoyau.on_clicked(update)
 
 
 ## Definition d'un bouton reset
@@ -72,4 +87,15 @@ button = Button(resetax, 'Reset', color=axcolor, hovercolor='0.975')
 
 def reset(event):
     ioN.reset()
-button.on_clicked(reset)
\ No newline at end of file
+button.on_clicked(reset)
+
+## Definition d'un bouton son : somme partielle affichee, jouee a 220 Hz et
+## enregistree dans un fichier WAV
+synthetiseur = Synthese_Audio.Synthetiseur(an, bn, f0=220., volume=0.5)
+sonax = plt.axes([0.03, 0.13, 0.1, 0.04])
+bouton_son = Button(sonax, 'son', color=axcolor, hovercolor='0.975')
+
+def son(event):
+    synthetiseur.regle(2*round(ioN.val)+1, ioNoyau.value_selected, immediat=True)
+    Synthese_Audio.ecrit_wav(synthetiseur, "Decomposition_triangle.wav", 2.)
+bouton_son.on_clicked(son)
\ No newline at end of file
@@ -0,0 +1,165 @@
+""" ====================================================================
+Diffraction de Fraunhofer par une ouverture quelconque, par FFT.
+
+Alors que diffraction_fente_bx.py et simu.py utilisent les formules
+analytiques (fente, fentes d'Young, réseau), on calcule ici la figure de
+diffraction à l'infini de n'importe quelle ouverture 1D ou 2D :
+ - tableau de transmission (réel, ou complexe pour un objet de phase),
+ - image (PNG...) lue par lit_image,
+ - ouvertures prédéfinies : fente, trou circulaire, réseau avec défauts
+   (fentes manquantes), réseau hexagonal de trous.
+
+L'éclairement est le module au carré de la transformée de Fourier de
+l'ouverture, complétée par des zéros (facteur de suréchantillonnage) pour
+bien résoudre la figure. Un objet Fraunhofer garde son tampon complété de
+zéros d'un calcul à l'autre (seule la zone de l'ouverture est réécrite) et
+utilise scipy.fft, qui conserve ses plans de calcul et répartit la FFT sur
+tous les coeurs ; pour une ouverture réelle, on n'effectue qu'une FFT
+réelle (deux fois moins de calculs) et l'on complète par symétrie. Le
+calcul est fait en simple précision par défaut : une ouverture de
+4096 x 4096 pixels (FFT de 8192 x 8192) prend environ une seconde.
+==================================================================== """
+
+import itertools
+import numpy as np
+import matplotlib.pyplot as plt
+import scipy.fft
+
+
+class Fraunhofer:
+    def __init__(self, forme, facteur=2, simple=True, workers=-1):
+        '''
+            : param forme : dimensions (en pixels) des ouvertures à traiter
+            : param facteur : facteur de complétion par des zéros
+            : param simple : calcul en simple précision (deux fois plus rapide,
+                             dynamique de 1e-7 largement suffisante pour l'affichage)
+            : param workers : nombre de coeurs utilisés par la FFT (-1 : tous)
+        '''
+        self.forme = tuple(np.atleast_1d(forme))
+        # dimensions paires, pour que la modulation ci-dessous centre la figure
+        self.taille = tuple(2*((facteur*n+1)//2) for n in self.forme)
+        self.reel = np.float32 if simple else np.float64
+        self.complexe = np.complex64 if simple else np.complex128
+        self.workers = workers
+        self.zone = tuple(slice(0, n) for n in self.forme)
+        # multiplier l'ouverture par (-1)^(i+j) décale sa transformée de la
+        # moitié du tableau : la fréquence nulle arrive directement au centre,
+        # sans fftshift
+        signe = np.ones(())
+        for n in self.forme:
+            signe = np.multiply.outer(signe, 1-2*(np.arange(n) % 2))
+        self.signe = signe.astype(self.reel)
+        self._tampons = {}
+
+    def _tampon(self, dtype):
+        # tampons complétés de zéros, alloués une seule fois par type
+        if dtype not in self._tampons:
+            self._tampons[dtype] = np.zeros(self.taille, dtype=dtype)
+        return self._tampons[dtype]
+
+    def intensite(self, ouverture, normalise=True):
+        '''
+            éclairement à l'infini (fréquence nulle au centre du tableau)
+            : param ouverture : transmission, de dimensions self.forme
+        '''
+        ouverture = np.asarray(ouverture)
+        if np.iscomplexobj(ouverture):
+            tampon = self._tampon(self.complexe)
+            np.multiply(ouverture, self.signe, out=tampon[self.zone])
+            F = scipy.fft.fftn(tampon, workers=self.workers)
+            I = F.real**2
+            I += F.imag**2
+        else:
+            tampon = self._tampon(self.reel)
+            np.multiply(ouverture, self.signe, out=tampon[self.zone])
+            demi = scipy.fft.rfftn(tampon, workers=self.workers)
+            I = demi.real**2
+            I += demi.imag**2
+            I = self._complete(I)
+        if normalise:
+            I /= I.max()
+        return I
+
+    def _complete(self, demi):
+        '''plan de Fourier complet à partir de la moitié donnée par rfftn,
+        en utilisant I(-k)=I(k) pour une ouverture réelle'''
+        m = demi.shape[-1]
+        I = np.empty(self.taille, dtype=demi.dtype)
+        I[..., :m] = demi
+        # I[k1, ..., k] = demi[-k1, ..., n-k] pour k >= m ; sur chaque axe,
+        # l'indice -k1 (modulo la taille) vaut 0 puis parcourt le reste à l'envers
+        colonnes = demi[..., m-2:0:-1]
+        for morceaux in itertools.product((0, 1), repeat=demi.ndim-1):
+            cible = tuple(slice(0, 1) if p == 0 else slice(1, None) for p in morceaux)
+            source = tuple(slice(0, 1) if p == 0 else slice(None, 0, -1) for p in morceaux)
+            I[cible+(slice(m, None),)] = colonnes[source]
+        return I
+
+    def frequences(self, pas=1.):
+        '''fréquences spatiales (en 1/unité de pas) le long de chaque axe,
+        dans l'ordre du tableau renvoyé par intensite'''
+        return [scipy.fft.fftshift(scipy.fft.fftfreq(n, pas)) for n in self.taille]
+
+
+""" -----------------------
+    Ouvertures prédéfinies (transmission 0 ou 1 sur n x n pixels)
+    ----------------------- """
+def _coordonnees(n):
+    x = np.arange(n)-(n-1)/2
+    return x[:, None], x[None, :]
+
+def fente(n, largeur):
+    y, x = _coordonnees(n)
+    return np.broadcast_to(np.abs(x) < largeur/2, (n, n)).astype(float)
+
+def trou_circulaire(n, rayon):
+    y, x = _coordonnees(n)
+    return (x**2+y**2 < rayon**2).astype(float)
+
+def reseau(n, periode, largeur, nombre, manquantes=0, rng=None):
+    '''réseau de nombre fentes, dont manquantes (tirées au hasard) sont bouchées'''
+    rng = np.random.default_rng(rng)
+    y, x = _coordonnees(n)
+    centres = (np.arange(nombre)-(nombre-1)/2)*periode
+    centres = np.delete(centres, rng.choice(nombre, manquantes, replace=False))
+    ouvert = np.zeros(n, dtype=bool)
+    for c in centres:
+        ouvert |= np.abs(x[0]-c) < largeur/2
+    return np.broadcast_to(ouvert, (n, n)).astype(float)
+
+def reseau_hexagonal(n, pas, rayon):
+    '''trous circulaires aux noeuds d'un réseau hexagonal'''
+    y, x = _coordonnees(n)
+    # coordonnées dans la base du réseau, puis distance au noeud le plus proche
+    v = y/(pas*np.sqrt(3)/2)
+    u = x/pas-v/2
+    distance = np.full((n, n), np.inf)
+    for du in (0, 1):
+        for dv in (0, 1):
+            i, j = np.floor(u)+du, np.floor(v)+dv
+            xn, yn = (i+j/2)*pas, j*pas*np.sqrt(3)/2
+            distance = np.minimum(distance, (x-xn)**2+(y-yn)**2)
+    return (distance < rayon**2).astype(float)
+
+def lit_image(fichier):
+    '''transmission lue dans une image (niveaux de gris entre 0 et 1)'''
+    image = plt.imread(fichier).astype(float)
+    if image.ndim == 3:
+        image = image[..., :3].mean(axis=2)
+    return image/image.max()
+
+
+if __name__ == '__main__':
+    n = 512
+    calcul = Fraunhofer((n, n))
+    ouvertures = {'trou circulaire': trou_circulaire(n, 20),
+                  'réseau, 3 fentes manquantes': reseau(n, 16, 4, 20, manquantes=3, rng=0),
+                  'réseau hexagonal': reseau_hexagonal(n, 24, 5)}
+    fig, axes = plt.subplots(2, len(ouvertures))
+    for k, (nom, ouverture) in enumerate(ouvertures.items()):
+        axes[0, k].imshow(ouverture, cmap='gray')
+        axes[0, k].set_title(nom)
+        I = calcul.intensite(ouverture)
+        axes[1, k].imshow(np.log10(I+1e-6)[n//2:3*n//2, n//2:3*n//2], cmap='inferno')
+        axes[1, k].set_title('log10(I/I0)')
+    plt.show()
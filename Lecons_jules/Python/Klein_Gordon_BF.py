@@ -7,6 +7,7 @@ inférieure à la pulsation plasma.
 
 from pylab import *
 from matplotlib import animation
+from Klein_Gordon_Phaseurs import Phaseurs
 
 dt = 0.01
 w=2*pi
@@ -32,6 +33,17 @@ line2,=plot([],[],color='r')
 line3,=plot(zedneg,[cos(-k*z) for z in zedneg],ls='dashed',color='g')
 line4,=plot(zedneg,[sin(-k*z) for z in zedneg],ls='dashed',color='b')
 
+# profils complexes des champs, calculés une seule fois :
+# onde incidente, onde réfléchie, leur somme et l'onde évanescente
+# (raccordée à la somme en z=0)
+Ei=0.5*exp(1j*k*zedneg)
+Er=0.5*exp(-1j*k*zedneg)
+phaseurs=Phaseurs(w)
+phaseurs.ajoute(line1,zed,(Ei[-1]+Er[-1])*exp(-kk*zed))
+phaseurs.ajoute(line2,zedneg,Ei+Er)
+phaseurs.ajoute(line3,zedneg,Ei)
+phaseurs.ajoute(line4,zedneg,Er)
+
 # fonction à définir quand blit=True
 # crée l'arrière de l'animation qui sera présent sur chaque image
 def init():
@@ -45,16 +57,7 @@ def init():
     return line1,line2,line3,line4,
 
 def animate(i): 
-    t = i * dt
-    Ei=[0.5*cos(w*t-k*z) for z in zedneg]
-    Er=[0.5*cos(w*t+k*z) for z in zedneg]
-    Es=[Ei[i]+Er[i] for i in range(500)]
-    Et=[Es[499]*exp(-kk*z) for z in zed]
-    line1.set_data(zed,Et)
-    line2.set_data(zedneg,Es)
-    line3.set_data(zedneg,Ei)
-    line4.set_data(zedneg,Er)
-    return line1,line2,line3,line4,
+    return phaseurs.image(i * dt)
  
 ani = animation.FuncAnimation(fig, animate, init_func=init, frames=2000, blit=True, interval=20, repeat=False)
 
@@ -0,0 +1,123 @@
+'''
+Ce programme résout par différences finies (schéma saute-mouton) l'équation
+de Klein-Gordon à une dimension
+
+    d²E/dt² = c² d²E/dz² - wp(z)² E
+
+pour un paquet d'ondes arrivant depuis le vide (z<0) sur un plasma de
+pulsation plasma wp (z>0). Contrairement à Klein_Gordon_HF et
+Klein_Gordon_BF, qui animent les champs stationnaires pour une seule
+pulsation, on voit ici le régime transitoire : réflexion des composantes
+w<wp, onde évanescente à l'interface et transmission des composantes w>wp.
+
+Unités : c=1. Les bords du domaine sont absorbants (couches éponges).
+Executer banc_essai() pour mesurer la vitesse du schéma (10^5 points x 10^5
+pas par défaut).
+'''
+
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib import animation
+
+
+class KleinGordon:
+    def __init__(self, zmin=-40., zmax=40., N=8000, wp=2*np.pi, courant=0.95, eponge=5.):
+        '''
+            : param zmin, zmax : bornes du domaine (interface vide-plasma en z=0)
+            : param N : nombre de points de la grille
+            : param wp : pulsation plasma dans la région z>0
+            : param courant : fraction du pas de temps maximal stable
+            : param eponge : épaisseur des couches absorbantes aux deux bords
+        '''
+        self.z = np.linspace(zmin, zmax, N)
+        self.dz = self.z[1]-self.z[0]
+        self.wp = wp
+        # condition de stabilité du schéma : dt² (4/dz² + wp²) <= 4
+        self.dt = courant*2/np.sqrt(4/self.dz**2+wp**2)
+        a = (self.dt/self.dz)**2
+        wp2 = np.where(self.z > 0, wp**2, 0.)
+        self.a = a
+        self.b = (2-2*a-self.dt**2*wp2)[1:-1]
+        # couches éponges : amortissement sigma(z) dE/dt, de profil quadratique
+        n_eponge = int(eponge/self.dz)
+        profil = (1-np.arange(n_eponge)/n_eponge)**2
+        sigma = 3*np.log(1e4)/eponge*profil    # aller-retour atténué d'un facteur 1e4
+        self.bords = (slice(1, 1+n_eponge), slice(N-1-n_eponge, N-1))
+        self.amortissement = (sigma*self.dt/2, sigma[::-1]*self.dt/2)
+        self.E = np.zeros(N)
+        self.E_prec = np.zeros(N)
+        self._tampon = np.empty(N-2)
+        self.t = 0.
+
+    def impulsion(self, z0=-15., largeur=1., k0=2*np.pi, amplitude=1.):
+        '''
+            paquet gaussien se propageant vers les z croissants dans le vide
+            : param z0 : position initiale du centre du paquet
+            : param largeur : largeur de l'enveloppe (plus elle est faible, plus le spectre est large)
+            : param k0 : nombre d'onde de la porteuse (k0=0 : impulsion gaussienne)
+        '''
+        def f(u):
+            return amplitude*np.exp(-(u/largeur)**2)*np.cos(k0*u)
+        self.E[:] = f(self.z-z0)
+        self.E_prec[:] = f(self.z-z0+self.dt)
+        self.t = 0.
+
+    def avance(self, n=1):
+        '''
+            effectue n pas de temps ; les opérations sont faites en place
+            sur des tableaux préalloués
+        '''
+        E, E_prec, tampon = self.E, self.E_prec, self._tampon
+        for i in range(n):
+            anciens = [E_prec[s].copy() for s in self.bords]
+            # E_suiv = a (E[i+1]+E[i-1]) + b E[i] - E_prec, écrit dans E_prec
+            np.add(E[2:], E[:-2], out=tampon)
+            tampon *= self.a
+            interieur = E_prec[1:-1]
+            np.subtract(tampon, interieur, out=interieur)
+            np.multiply(self.b, E[1:-1], out=tampon)
+            interieur += tampon
+            # correction d'amortissement dans les couches éponges :
+            # (1+s) E_suiv = ... - (1-s) E_prec
+            for s, g, E0 in zip(self.bords, self.amortissement, anciens):
+                E_prec[s] = (E_prec[s]+g*E0)/(1+g)
+            E, E_prec = E_prec, E
+            self.t += self.dt
+        self.E, self.E_prec = E, E_prec
+        return E
+
+
+def banc_essai(N=10**5, pas=10**5):
+    '''mesure le temps de calcul de pas itérations sur N points'''
+    kg = KleinGordon(N=N)
+    kg.impulsion()
+    debut = time.perf_counter()
+    kg.avance(pas)
+    duree = time.perf_counter()-debut
+    print('%d points x %d pas : %.1f s (%.2f ns par point et par pas)'
+          % (N, pas, duree, 1e9*duree/(N*pas)))
+    return duree
+
+
+if __name__ == '__main__':
+    kg = KleinGordon()
+    kg.impulsion()
+    pas_par_image = 10
+
+    fig = plt.figure()
+    plt.title(r"Paquet d'ondes sur un plasma ($\omega_0=\omega_p$)")
+    plt.xlabel('$z$')
+    plt.ylabel(r'$E_x/E_0$')
+    plt.xlim([-25, 15])
+    plt.ylim([-1.5, 1.5])
+    plt.axvspan(0, 40, color='0.9')
+    plt.text(1, 1.3, 'plasma')
+    line, = plt.plot(kg.z, kg.E)
+
+    def animate(i):
+        line.set_ydata(kg.avance(pas_par_image))
+        return line,
+
+    ani = animation.FuncAnimation(fig, animate, frames=2000, blit=True, interval=20, repeat=False)
+    plt.show()
@@ -8,6 +8,7 @@ supérieure à la pulsation plasma.
 
 from pylab import *
 from matplotlib import animation
+from Klein_Gordon_Phaseurs import Phaseurs
 
 dt = 0.01
 w=2*pi
@@ -30,6 +31,11 @@ xlim([-5,10])
 line1,=plot([],[])
 line2,=plot([],[])
 
+# profils complexes des champs, calculés une seule fois
+phaseurs=Phaseurs(w)
+phaseurs.ajoute(line1,zed,exp(1j*kk*zed))
+phaseurs.ajoute(line2,zedneg,exp(1j*k*zedneg))
+
 # fonction à définir quand blit=True
 # crée l'arrière de l'animation qui sera présent sur chaque image
 def init():
@@ -41,12 +47,7 @@ def init():
     return line1,line2,
 
 def animate(i): 
-    t = i * dt
-    E1=[cos(w*t-kk*z) for z in zed]
-    E2=[cos(w*t-k*z) for z in zedneg]
-    line1.set_data(zed,E1)
-    line2.set_data(zedneg,E2)
-    return line1,line2,
+    return phaseurs.image(i * dt)
  
 ani = animation.FuncAnimation(fig, animate, init_func=init, frames=2000, blit=True, interval=20, repeat=False)
 
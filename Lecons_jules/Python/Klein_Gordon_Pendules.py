@@ -0,0 +1,128 @@
+'''
+Analogue mécanique de l'équation de Klein-Gordon : chaîne de pendules
+identiques couplés par des ressorts de torsion. Pour de petits angles,
+l'angle x_n du pendule n obéit à l'équation de Klein-Gordon discrète
+
+    d²x_n/dt² = -w0² x_n + K (x_{n+1} - 2 x_n + x_{n-1})
+
+de relation de dispersion w² = w0² + 4K sin²(ka/2) : les ondes de
+pulsation inférieure à w0 ne se propagent pas (comme dans un plasma sous
+la pulsation plasma, cf. Klein_Gordon_BF).
+
+Plutôt que d'intégrer numériquement l'équation différentielle, on
+diagonalise une fois pour toutes la matrice de raideur (tridiagonale) ;
+le mouvement est alors exact dans la base des modes propres, et chaque
+image ne coûte qu'un changement de base :
+ - chaîne uniforme : transformée en sinus (extrémités fixes) ou en cosinus
+   (extrémités libres) discrète, en O(N log N), jusqu'à 10^5 pendules ;
+ - chaîne quelconque (w0 et K différents d'un pendule à l'autre) : un
+   produit matrice-vecteur par la matrice des modes propres, calculée une
+   seule fois par jeu de paramètres (mise en cache).
+'''
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib import animation
+from scipy.fft import dst, dct, idct
+from scipy.linalg import eigh_tridiagonal
+
+# modes propres des chaînes non uniformes déjà diagonalisées
+_cache_modes = {}
+
+
+def _modes(diagonale, hors_diagonale):
+    '''pulsations propres et matrice des modes, mises en cache'''
+    cle = (diagonale.tobytes(), hors_diagonale.tobytes())
+    if cle not in _cache_modes:
+        valeurs, vecteurs = eigh_tridiagonal(diagonale, hors_diagonale)
+        # valeurs propres nulles (w0=0, extrémités libres) : pas de racine négative
+        _cache_modes[cle] = (np.sqrt(np.maximum(valeurs, 0.)), vecteurs)
+    return _cache_modes[cle]
+
+
+class Chaine:
+    def __init__(self, N=100, w0=2*np.pi, K=100., extremites='fixes'):
+        '''
+            : param N : nombre de pendules
+            : param w0 : pulsation propre des pendules (scalaire ou tableau de N valeurs)
+            : param K : constante de couplage (scalaire ou tableau de N-1 valeurs)
+            : param extremites : 'fixes' (reliées à un bâti par le même couplage) ou 'libres'
+        '''
+        self.N = N
+        self.uniforme = np.ndim(w0) == 0 and np.ndim(K) == 0
+        self.extremites = extremites
+        if self.uniforme:
+            j = np.arange(N)
+            if extremites == 'fixes':
+                self.w = np.sqrt(w0**2+4*K*np.sin((j+1)*np.pi/(2*(N+1)))**2)
+            else:
+                self.w = np.sqrt(w0**2+4*K*np.sin(j*np.pi/(2*N))**2)
+        else:
+            w0 = np.broadcast_to(np.asarray(w0, dtype=float), (N,))
+            K = np.broadcast_to(np.asarray(K, dtype=float), (N-1,))
+            diagonale = w0**2+np.concatenate([K, [0.]])+np.concatenate([[0.], K])
+            if extremites == 'fixes':
+                diagonale[0] += K[0]
+                diagonale[-1] += K[-1]
+            self.w, self.vecteurs = _modes(diagonale, -K)
+        self.a = np.zeros(N)
+        self.b = np.zeros(N)
+
+    def analyse(self, x):
+        '''coordonnées modales d'une configuration x'''
+        if not self.uniforme:
+            return self.vecteurs.T @ x
+        if self.extremites == 'fixes':
+            return dst(x, type=1, norm='ortho')
+        return dct(x, type=2, norm='ortho')
+
+    def synthese(self, q):
+        '''configuration associée aux coordonnées modales q'''
+        if not self.uniforme:
+            return self.vecteurs @ q
+        if self.extremites == 'fixes':
+            return dst(q, type=1, norm='ortho')
+        return idct(q, type=2, norm='ortho')
+
+    def conditions_initiales(self, x0, v0=0.):
+        '''
+            : param x0 : angles initiaux
+            : param v0 : vitesses angulaires initiales
+        Un mode de pulsation nulle (translation d'ensemble, pour w0=0 et des
+        extrémités libres) a un mouvement uniforme : b est alors sa vitesse.
+        '''
+        self.a = self.analyse(np.broadcast_to(np.asarray(x0, dtype=float), (self.N,)))
+        v = self.analyse(np.broadcast_to(np.asarray(v0, dtype=float), (self.N,)))
+        self.b = np.divide(v, self.w, out=v, where=self.w > 0)
+
+    def angles(self, t):
+        '''angles exacts des pendules à l'instant t'''
+        wt = self.w*t
+        return self.synthese(self.a*np.cos(wt)+self.b*np.where(self.w > 0, np.sin(wt), t))
+
+
+if __name__ == '__main__':
+    # on lâche le premier pendule d'une chaîne au repos : l'ébranlement se
+    # propage en se déformant (dispersion) et laisse derrière lui des
+    # oscillations à la pulsation de coupure w0
+    N = 100
+    chaine = Chaine(N)
+    x0 = np.zeros(N)
+    x0[:5] = 1
+    chaine.conditions_initiales(x0)
+    dt = 0.01
+
+    fig = plt.figure()
+    plt.title("Chaîne de pendules couplés (Klein-Gordon discrète)")
+    plt.xlabel('numéro du pendule')
+    plt.ylabel('angle (u.a.)')
+    plt.xlim([0, N])
+    plt.ylim([-1.2, 1.2])
+    line, = plt.plot(np.arange(N), x0, 'o-', ms=3)
+
+    def animate(i):
+        line.set_ydata(chaine.angles(i*dt))
+        return line,
+
+    ani = animation.FuncAnimation(fig, animate, frames=2000, blit=True, interval=20, repeat=False)
+    plt.show()
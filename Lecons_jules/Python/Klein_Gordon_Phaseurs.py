@@ -0,0 +1,52 @@
+'''
+Moteur d'animation commun aux programmes Klein_Gordon_HF et Klein_Gordon_BF.
+
+Chaque champ trace est de la forme E(z,t) = Re(A(z) exp(-i w t)) : son
+profil complexe A(z) est calcule une seule fois, puis chaque image de
+l'animation s'obtient par une unique operation vectorisee sur tous les
+champs a la fois,
+    E(z,t) = Re(A) cos(w t) + Im(A) sin(w t),
+au lieu de recalculer un cosinus par point a chaque image. On peut ainsi
+utiliser des grilles en z beaucoup plus fines sans ralentir l'animation.
+'''
+
+import numpy as np
+
+
+class Phaseurs:
+    def __init__(self, w):
+        '''
+            : param w : pulsation commune a tous les champs
+        '''
+        self.w = w
+        self.lignes = []
+        self.z = []
+        self.re = np.zeros(0)
+        self.im = np.zeros(0)
+        self.bornes = [0]
+
+    def ajoute(self, ligne, z, A):
+        '''
+            associe a la courbe ligne le champ Re(A(z) exp(-i w t))
+            : param z : abscisses des points
+            : param A : profil complexe (tableau de meme taille que z)
+        '''
+        A = np.broadcast_to(np.asarray(A, dtype=complex), np.shape(z))
+        self.lignes.append(ligne)
+        self.z.append(np.asarray(z))
+        # tous les profils sont concatenes pour n'effectuer qu'un calcul par image
+        self.re = np.concatenate([self.re, A.real])
+        self.im = np.concatenate([self.im, A.imag])
+        self.bornes.append(len(self.re))
+
+    def champs(self, t):
+        '''valeurs des champs a l'instant t, dans l'ordre d'ajout'''
+        wt = self.w * t
+        E = self.re * np.cos(wt) + self.im * np.sin(wt)
+        return [E[debut:fin] for debut, fin in zip(self.bornes[:-1], self.bornes[1:])]
+
+    def image(self, t):
+        '''met a jour toutes les courbes a l'instant t et les renvoie (blit)'''
+        for ligne, z, E in zip(self.lignes, self.z, self.champs(t)):
+            ligne.set_data(z, E)
+        return tuple(self.lignes)
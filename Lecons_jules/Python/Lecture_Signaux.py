@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""
+Lecture de signaux enregistrés (fichiers WAV, exports CSV ou binaires
+d'oscilloscope) pour l'analyse spectrale de Décomposition_tous.
+
+Les fichiers ne sont jamais lus en entier : les WAV et les fichiers
+binaires sont projetés en mémoire (np.memmap), le système ne chargeant que
+les pages effectivement utilisées ; un CSV, qui ne peut pas l'être
+directement, est converti une fois pour toutes, par blocs de lignes, en un
+fichier binaire voisin (<fichier>.<colonnes>_<séparateur>.f64, un par choix
+de colonnes et de séparateur), projeté en mémoire à son tour et réutilisé
+tant que le CSV n'est pas modifié ; la conversion est écrite dans un
+fichier temporaire, renommé seulement une fois terminée. Des enregistrements de
+plusieurs gigaoctets s'ouvrent donc instantanément (ou en un seul passage
+pour un CSV), sans occuper la mémoire vive.
+
+On extrait ensuite une période du signal, choisie par l'utilisateur ou
+détectée par autocorrélation (calculée par FFT sur un extrait), rééchantillonnée
+sur le nombre de points voulu pour le curseur des harmoniques.
+"""
+import os
+import itertools
+import numpy as np
+import scipy.fft
+import scipy.io.wavfile
+
+LIGNES_BLOC=10**6       # lignes de CSV converties à la fois
+EXTRAIT=2**20           # échantillons utilisés pour l'autocorrélation
+
+def lit_wav(fichier,canal=0):
+    '''fréquence d'échantillonnage et échantillons (projetés en mémoire) d'un
+    canal d'un fichier WAV'''
+    fe,x=scipy.io.wavfile.read(fichier,mmap=True)
+    if x.ndim==2:
+        x=x[:,canal]
+    return fe,x
+
+def lit_binaire(fichier,fe,dtype=np.int16,canaux=1,canal=0,entete=0):
+    '''
+        échantillons (projetés en mémoire) d'une acquisition binaire brute
+        : param fe : fréquence d'échantillonnage (Hz)
+        : param dtype : type des échantillons
+        : param canaux : nombre de canaux entrelacés
+        : param entete : nombre d'octets à sauter en début de fichier
+    '''
+    x=np.memmap(fichier,dtype=dtype,mode='r',offset=entete)
+    x=x[:len(x)//canaux*canaux].reshape(-1,canaux)
+    return fe,x[:,canal]
+
+def _numerique(ligne,delimiteur):
+    try:
+        [float(v) for v in ligne.split(delimiteur) if v.strip()]
+        return True
+    except ValueError:
+        return False
+
+def lit_csv(fichier,colonne=1,colonne_temps=0,delimiteur=','):
+    '''
+        fréquence d'échantillonnage (déduite de la colonne des temps) et
+        échantillons d'un export CSV ; les lignes d'en-tête non numériques
+        sont ignorées
+    '''
+    separateur=delimiteur.encode().hex() if delimiteur else 'blancs'
+    cache='%s.%d_%d_%s.f64' % (fichier,colonne_temps,colonne,separateur)
+    colonnes=(colonne_temps,colonne)
+    if not os.path.exists(cache) or os.path.getmtime(cache)<os.path.getmtime(fichier):
+        temporaire=cache+'.tmp'
+        try:
+            with open(fichier) as entree, open(temporaire,'wb') as sortie:
+                lignes=itertools.dropwhile(lambda l:not _numerique(l,delimiteur),entree)
+                while True:
+                    bloc=list(itertools.islice(lignes,LIGNES_BLOC))
+                    if not bloc:
+                        break
+                    np.loadtxt(bloc,delimiter=delimiteur,usecols=colonnes,ndmin=2).tofile(sortie)
+        except BaseException:
+            if os.path.exists(temporaire):
+                os.remove(temporaire)
+            raise
+        os.replace(temporaire,cache)
+    donnees=np.memmap(cache,dtype=np.float64,mode='r').reshape(-1,2)
+    return 1/(donnees[1,0]-donnees[0,0]),donnees[:,1]
+
+def charge(fichier,**options):
+    '''fréquence d'échantillonnage et échantillons, selon l'extension du
+    fichier (.wav, .csv ou .txt, binaire sinon : voir lit_binaire)'''
+    extension=os.path.splitext(fichier)[1].lower()
+    if extension=='.wav':
+        return lit_wav(fichier,**options)
+    if extension in ('.csv','.txt'):
+        return lit_csv(fichier,**options)
+    return lit_binaire(fichier,**options)
+
+def periode_autocorrelation(x,fe,debut=0.,T_min=None,T_max=None,seuil=0.9):
+    '''
+        période (s) d'un signal, détectée sur un extrait commençant à debut (s) :
+        premier maximum local de l'autocorrélation (entre T_min et T_max)
+        atteignant seuil fois la plus grande valeur, affiné par interpolation
+        parabolique sur le maximum correspondant à de nombreuses périodes
+    '''
+    i0=int(debut*fe)
+    extrait=np.asarray(x[i0:i0+EXTRAIT],dtype=float)
+    extrait=extrait-extrait.mean()
+    n=len(extrait)
+    spectre=scipy.fft.rfft(extrait,scipy.fft.next_fast_len(2*n,real=True))
+    r=scipy.fft.irfft(spectre.real**2+spectre.imag**2)[:n//2]
+    r/=np.arange(n,n-len(r),-1)     # estimateur non biaisé
+    d_min=max(1,int((T_min or 0)*fe))
+    d_max=min(len(r)-1,int(T_max*fe) if T_max else len(r)-1)
+    d=np.arange(d_min,d_max)
+    maxima=d[(r[d]>=r[d-1])&(r[d]>r[d+1])]
+    if len(maxima)==0:
+        raise ValueError("pas de période détectée entre %g s et %g s" % (d_min/fe,d_max/fe))
+    retard=maxima[np.argmax(r[maxima]>=seuil*r[maxima].max())]
+    periode=_sommet(r,retard)
+    # affinage sur le maximum associé à un grand nombre m de périodes :
+    # l'erreur sur la position du sommet est divisée par m
+    m=2
+    while m*periode+2<len(r)//2:
+        centre=int(round(m*periode))
+        retard=centre-2+np.argmax(r[centre-2:centre+3])
+        periode=_sommet(r,retard)/m
+        m*=2
+    return periode/fe
+
+def _sommet(r,i):
+    '''position du sommet de la parabole passant par r[i-1], r[i], r[i+1]'''
+    a,b,c=r[i-1:i+2]
+    return i+0.5*(a-c)/(a-2*b+c)
+
+def une_periode(x,fe,N,debut=0.,periode=None):
+    '''
+        une période du signal à partir de debut (s), rééchantillonnée sur N points
+        : param periode : durée de la période (s), détectée par autocorrélation si None
+    '''
+    if periode is None:
+        periode=periode_autocorrelation(x,fe,debut)
+    t=(debut+np.arange(N)*periode/N)*fe
+    i0=int(t[0])
+    morceau=np.asarray(x[i0:int(t[-1])+2],dtype=float)
+    return np.interp(t-i0,np.arange(len(morceau)),morceau)
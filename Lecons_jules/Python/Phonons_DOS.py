@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Densité d'états des phonons et capacité thermique au-delà des modèles
+d'Einstein et de Debye (cf. Capacité_Calorifique).
+
+On considère des réseaux de Born-von Kármán (chaîne 1D, réseau carré 2D,
+réseau cubique simple 3D, interactions entre plus proches voisins), de
+relation de dispersion
+    w(k) = w_max sqrt( (1/d) * somme_i sin²(k_i a/2) ).
+La première zone de Brillouin est échantillonnée sur une grille uniforme de
+n^d points, traitée par blocs pour borner la mémoire (10^7 points en 3D ne
+posent pas de problème). La densité d'états g(w) est l'histogramme des
+pulsations, et la capacité thermique (normalisée par 3kB par atome) est,
+pour toutes les températures à la fois, un unique produit matrice-vecteur
+    C(T) = somme_w g(w) (x/2)²/sinh²(x/2),   x = hbar w/(kB T).
+
+Unités réduites : w en unités de w_max, T en unités de hbar w_max/kB.
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+
+from Capacité_Calorifique import Einstein, Debye
+
+def dispersion(k):
+    '''pulsation réduite w/w_max pour des vecteurs d'onde k (en unités de 1/a),
+    tableau de forme (nombre de points, dimension)'''
+    return np.sqrt(np.mean(np.sin(k/2)**2,axis=1))
+
+def densite_etats(dimension,n,nb_classes=400,taille_bloc=10**6):
+    '''densité d'états normalisée (somme égale à 1) sur nb_classes intervalles
+    de [0,1], à partir d'une grille de n^dimension vecteurs d'onde de la
+    première zone de Brillouin, traitée par blocs de taille_bloc points.
+    Renvoie les centres des intervalles et g.'''
+    forme=(n,)*dimension
+    total=n**dimension
+    comptes=np.zeros(nb_classes)
+    for debut in range(0,total,taille_bloc):
+        indices=np.arange(debut,min(debut+taille_bloc,total))
+        j=np.stack(np.unravel_index(indices,forme),axis=1)
+        k=2*np.pi*(j+0.5)/n-np.pi
+        classes=np.minimum((dispersion(k)*nb_classes).astype(int),nb_classes-1)
+        comptes+=np.bincount(classes,minlength=nb_classes)
+    w=(np.arange(nb_classes)+0.5)/nb_classes
+    return w,comptes/total
+
+def capacite(w,g,T):
+    '''capacité thermique réduite pour toutes les températures T à la fois'''
+    x=w[None,:]/np.asarray(T,dtype=float)[:,None]
+    e=np.exp(-x)
+    poids=x**2*e/(1-e)**2          # (x/2)²/sinh²(x/2), sans débordement
+    return poids@g
+
+if __name__=='__main__':
+    T=np.linspace(0.005,1,400)
+    fig,(ax1,ax2)=plt.subplots(1,2)
+    for dimension,n in [(1,10**6),(2,3000),(3,216)]:
+        w,g=densite_etats(dimension,n)
+        ax1.plot(w,g*len(w),label='%dD (%d points)' % (dimension,n**dimension))
+        ax2.plot(T,capacite(w,g,T),label='%dD' % dimension)
+    ax2.plot(T,Debye(T),'k--',label=r'Debye ($\theta_D=\hbar\omega_{max}/k_B$)')
+    ax2.plot(T,Einstein(2*T),'k:',label=r'Einstein ($\theta_E=\hbar\omega_{max}/k_B$)')
+    ax1.set_xlabel(r'$\omega/\omega_{max}$')
+    ax1.set_ylabel("Densité d'états")
+    ax1.legend()
+    ax2.set_xlabel(r'$k_BT/\hbar\omega_{max}$')
+    ax2.set_ylabel('Capacité thermique /3kB')
+    ax2.grid()
+    ax2.legend()
+    plt.show()
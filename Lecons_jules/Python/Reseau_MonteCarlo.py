@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+"""
+Réseaux imparfaits : effet du désordre sur la figure de diffraction par N
+fentes (I_reseau de diffraction_fente_bx).
+
+Chaque réalisation est un réseau de N fentes de largeur a, au pas e, dont
+les positions sont décalées aléatoirement (écart type sigma) et dont chaque
+fente est bouchée avec la probabilité p. L'amplitude diffractée est une
+somme de phaseurs,
+    A(theta) = F(theta) * somme_j m_j exp(2i pi x_j sin(theta)/lambda0),
+(F : terme de diffraction par une fente, m_j = 0 ou 1) calculée pour tout
+un lot de réalisations à la fois (tableau réalisations x fentes x écran,
+en simple précision, sommé sur les fentes par un produit matriciel).
+On renvoie la moyenne et la variance de l'éclairement (normalisé par N²
+comme I_reseau) sur l'ensemble des réalisations ; sans désordre (sigma=0,
+p=0), on retrouve exactement I_reseau.
+
+Les réalisations sont réparties en tâches de taille fixe, exécutées par
+plusieurs processus ; chaque tâche a son propre générateur aléatoire, issu
+de SeedSequence(graine).spawn, si bien que le résultat ne dépend que de la
+graine, pas du nombre de processus. Moyennes et variances partielles sont
+combinées par la formule de Chan (pas de perte de précision par
+soustraction de grands nombres).
+
+La moyenne théorique (moyenne_theorique) s'en déduit analytiquement : avec
+q=1-p et chi=exp(-(k sigma sin(theta))²/2),
+    <I> = F² [q² chi² |somme_j exp(i k j e sin(theta))|² + N (q - q² chi²)] / N².
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import matplotlib.pyplot as plt
+
+# mêmes paramètres que diffraction_fente_bx
+a=0.24e-3
+e=2e-3
+lambda0=633.e-9
+
+TAILLE_BLOC=2**22   # nombre d'éléments (réalisations x fentes x écran) par lot
+TAILLE_TACHE=256    # nombre de réalisations par tâche
+
+
+def _combine(n1,m1,M1,n2,m2,M2):
+    '''réunion de deux échantillons (effectif, moyenne, somme des carrés des écarts)'''
+    n=n1+n2
+    d=m2-m1
+    return n,m1+d*n2/n,M1+M2+d*d*n1*n2/n
+
+def _tache(graine,n,N,sigma,p,theta,a,e,lambda0,taille_bloc):
+    '''n réalisations : effectif, moyenne et somme des carrés des écarts'''
+    rng=np.random.default_rng(graine)
+    s=np.sin(theta)
+    k=2*np.pi/lambda0
+    F=np.sinc(a*s/lambda0)**2/N**2
+    # phase du réseau parfait, ramenée dans [0, 2pi[ en double précision ;
+    # le décalage dû au désordre reste petit et se calcule en simple précision
+    phi0=np.mod(k*np.outer((np.arange(N)-(N-1)/2)*e,s),2*np.pi).astype(np.float32)
+    s32=s.astype(np.float32)
+    resultat=(0,0.,0.)
+    lot=max(1,taille_bloc//(N*len(s)))
+    for debut in range(0,n,lot):
+        b=min(lot,n-debut)
+        m=(rng.random((b,N))>=p).astype(np.float32)
+        if sigma==0:
+            phi=phi0
+            Are,Aim=m@np.cos(phi),m@np.sin(phi)
+        else:
+            decalage=(k*sigma*rng.standard_normal((b,N))).astype(np.float32)
+            phi=phi0+decalage[:,:,None]*s32
+            Are,Aim=(m[:,None,:]@np.cos(phi))[:,0],(m[:,None,:]@np.sin(phi))[:,0]
+        I=F*(Are.astype(float)**2+Aim.astype(float)**2)
+        resultat=_combine(*resultat,b,I.mean(axis=0),I.var(axis=0)*b)
+    return resultat
+
+def ensemble(N,sigma,p,n_realisations,theta,graine=0,processus=None,
+             a=a,e=e,lambda0=lambda0,taille_tache=TAILLE_TACHE,taille_bloc=TAILLE_BLOC):
+    '''
+        moyenne et variance de l'éclairement sur n_realisations réseaux désordonnés
+        : param N : nombre de fentes
+        : param sigma : écart type des positions des fentes (m)
+        : param p : probabilité qu'une fente soit bouchée
+        : param theta : directions d'observation
+        : param graine : graine du générateur, dont dérivent ceux des tâches
+        : param processus : nombre de processus (par défaut, autant que de coeurs)
+    '''
+    theta=np.asarray(theta,dtype=float)
+    tailles=[taille_tache]*(n_realisations//taille_tache)
+    if n_realisations%taille_tache:
+        tailles.append(n_realisations%taille_tache)
+    graines=np.random.SeedSequence(graine).spawn(len(tailles))
+    with ProcessPoolExecutor(processus) as executeur:
+        resultats=executeur.map(_tache,graines,tailles,*([x]*len(tailles) for x in
+                                (N,sigma,p,theta,a,e,lambda0,taille_bloc)))
+        total=(0,0.,0.)
+        for r in resultats:
+            total=_combine(*total,*r)
+    n,moyenne,M2=total
+    return moyenne,M2/max(n-1,1)
+
+def moyenne_theorique(N,sigma,p,theta,a=a,e=e,lambda0=lambda0):
+    '''éclairement moyen exact du réseau désordonné'''
+    s=np.sin(theta)
+    k=2*np.pi/lambda0
+    q=1-p
+    chi2=np.exp(-(k*sigma*s)**2)
+    ideal=np.abs(np.exp(1j*k*e*np.outer(s,np.arange(N))).sum(axis=1))**2
+    return np.sinc(a*s/lambda0)**2*(q**2*chi2*ideal+N*(q-q**2*chi2))/N**2
+
+
+if __name__=='__main__':
+    theta=np.linspace(-np.pi/1000,np.pi/1000,1000)
+    N=20
+    fig,axes=plt.subplots(2,1,sharex=True)
+    for ax,(sigma,p) in zip(axes,[(0.1*e,0.),(0.,0.2)]):
+        t=time.time()
+        moyenne,variance=ensemble(N,sigma,p,4000,theta)
+        print('4000 réalisations : %.2f s (%d coeurs)' % (time.time()-t,os.cpu_count()))
+        ax.plot(theta,moyenne_theorique(N,0.,0.,theta),'k:',lw=1,label='réseau parfait')
+        ax.plot(theta,moyenne,label='moyenne')
+        ax.fill_between(theta,moyenne-np.sqrt(variance),moyenne+np.sqrt(variance),
+                        alpha=0.3,label='± écart type')
+        ax.plot(theta,moyenne_theorique(N,sigma,p,theta),'r--',lw=1,label='moyenne théorique')
+        ax.set_title('N=%d, sigma=%.2f e, p=%.2f' % (N,sigma/e,p))
+        ax.set_ylabel('I/I_0')
+        ax.legend(loc=1)
+    axes[-1].set_xlabel('theta (rad)')
+    plt.show()
@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+Outils communs aux démonstrations de séries de Fourier
+(Décomposition_créneaux, Décomposition_triangle, Décomposition_tous).
+
+SommesPartielles : sommes partielles S_N(x) = base(x) + somme_{n=0}^{N} terme(n,x)
+sur une grille x fixée, pour un curseur « nombre d'harmoniques ». Les termes
+sont évalués par blocs (un seul calcul vectorisé par bloc d'harmoniques)
+et cumulés ; les sommes partielles sont conservées au fur et à mesure que
+N augmente, si bien qu'une position déjà atteinte est servie par une simple
+lecture de tableau. Pour borner la mémoire (N jusqu'à 10^4 sur quelques
+milliers de points), on ne garde qu'une somme partielle toutes les « pas »
+harmoniques, pas étant le plus petit entier compatible avec la mémoire
+allouée ; il reste alors au plus pas-1 termes à ajouter, en un seul calcul.
+
+coefficients_affines : coefficients de Fourier exacts d'un signal périodique
+affine par morceaux, donné par ses points anguleux. Sur un segment [ta,tb]
+où f(t)=ya+s(t-ta), deux intégrations par parties donnent
+    intégrale f exp(-iwt) dt = [(i f(t)/w + s/w²) exp(-iwt)] de ta à tb,
+d'où c_n pour toutes les harmoniques par quelques produits matrice-vecteur
+(harmoniques x points), sans échantillonnage ni repliement de spectre.
+
+Sommations : la somme partielle pondérée S_N = a_0 + somme w_n (a_n cos + b_n sin)
+avec les noyaux de Dirichlet (w_n=1, somme partielle ordinaire), de Fejér
+(w_n=1-n/(N+1)), de Lanczos (w_n=sinc(n/(N+1))) ou en cosinus surélevé
+(w_n=(1+cos(pi n/(N+1)))/2) est échantillonnée sur une période par une
+seule FFT réelle inverse du vecteur des coefficients pondérés. balayage en
+déduit, pour chaque N, le dépassement (phénomène de Gibbs) et l'erreur
+quadratique, calculée exactement par la formule de Parseval.
+"""
+import numpy as np
+import matplotlib.pyplot as plt
+import scipy.fft
+
+MEMOIRE=2**26       # octets alloués aux sommes partielles conservées
+TAILLE_BLOC=2**20   # nombre d'éléments (harmoniques x points) évalués à la fois
+
+class SommesPartielles:
+    def __init__(self,terme,x,base=0.,N_max=10**4,memoire=MEMOIRE):
+        '''
+            : param terme : fonction terme(n,x) vectorisée (n en colonne, x en ligne)
+            : param x : grille des abscisses
+            : param base : terme constant ajouté à toutes les sommes
+            : param N_max : plus grand N demandé, pour le calcul du pas
+            : param memoire : mémoire maximale (octets) des sommes conservées
+        '''
+        self.terme=terme
+        self.x=np.asarray(x,dtype=float)
+        self.pas=max(1,-(-(N_max+2)*self.x.size*8//memoire))
+        # ligne j : base + somme des j*pas premiers termes
+        self.lignes_max=N_max//self.pas+2
+        self.table=np.empty((min(self.lignes_max,16),self.x.size))
+        self.table[0]=base
+        self.lignes=1
+
+    def _termes(self,debut,fin):
+        '''termes debut <= n < fin, tableau (fin-debut) x len(x)'''
+        return self.terme(np.arange(debut,fin)[:,None],self.x[None,:])
+
+    def _etend(self,lignes):
+        '''calcule les sommes conservées jusqu'à la ligne lignes-1'''
+        if lignes>len(self.table):
+            table=np.empty((max(lignes,min(2*len(self.table),self.lignes_max)),self.x.size))
+            table[:self.lignes]=self.table[:self.lignes]
+            self.table=table
+        bloc=max(1,TAILLE_BLOC//(self.pas*self.x.size))*self.pas
+        S=self.table[self.lignes-1].copy()
+        n=(self.lignes-1)*self.pas
+        while self.lignes<lignes:
+            fin=min(n+bloc,(lignes-1)*self.pas)
+            cumul=np.cumsum(self._termes(n,fin),axis=0)+S
+            garde=cumul[self.pas-1::self.pas]
+            self.table[self.lignes:self.lignes+len(garde)]=garde
+            self.lignes+=len(garde)
+            S=cumul[-1]
+            n=fin
+
+    def __call__(self,N):
+        '''somme partielle S_N (N+1 termes, de n=0 à n=N ; base seule si N<0)'''
+        N=int(N)+1
+        j,reste=divmod(max(N,0),self.pas)
+        if j>=self.lignes:
+            self._etend(j+1)
+        if reste==0:
+            S=self.table[j]
+            S.flags.writeable=False
+            return S
+        return self.table[j]+self._termes(j*self.pas,N).sum(axis=0)
+
+def _segments(points,T):
+    '''segments de durée non nulle : début (ta,ya), fin (tb,yb), pente s'''
+    t,y=np.asarray(points,dtype=float).T
+    t=np.append(t,t[0]+T)
+    y=np.append(y,y[0])
+    garde=np.diff(t)>0
+    ta,tb=t[:-1][garde],t[1:][garde]
+    ya,yb=y[:-1][garde],y[1:][garde]
+    return ta,tb,ya,yb,(yb-ya)/(tb-ta)
+
+def coefficients_affines(points,N,T=1.,taille_bloc=TAILLE_BLOC):
+    '''
+        coefficients de Fourier exacts d'un signal affine par morceaux,
+        f(t) = a_0 + somme_{n=1}^{N} a_n cos(2 pi n t/T) + b_n sin(2 pi n t/T)
+        : param points : points anguleux (t_k, y_k) d'une période, par t
+                         croissants dans [t_0, t_0+T] ; une discontinuité est
+                         décrite par deux points de même t (valeurs à gauche
+                         puis à droite). Le dernier point est relié au premier
+                         décalé de T (un dernier point en t_0+T donne la
+                         valeur à gauche d'un saut en t_0).
+        : param N : rang de la dernière harmonique
+        : return : tableaux a et b de N+1 valeurs (a[0] valeur moyenne, b[0]=0)
+    '''
+    ta,tb,ya,yb,s=_segments(points,T)
+    c=np.empty(N+1,dtype=complex)
+    c[0]=np.sum((ya+yb)/2*(tb-ta))/T
+    pas=max(1,taille_bloc//len(ta))
+    for debut in range(1,N+1,pas):
+        w=2*np.pi/T*np.arange(debut,min(debut+pas,N+1))
+        Ea=np.exp(-1j*np.outer(w,ta))
+        Eb=np.exp(-1j*np.outer(w,tb))
+        c[debut:debut+pas]=(1j*(Eb@yb-Ea@ya)/w+(Eb@s-Ea@s)/w**2)/T
+    a=2*c.real
+    b=-2*c.imag
+    a[0]=c[0].real
+    b[0]=0
+    return a,b
+
+
+# noyaux de sommation : poids w_n en fonction de x=n/(N+1)
+NOYAUX={'Dirichlet':np.ones_like,
+        'Fejér':lambda x:1-x,
+        'Lanczos':np.sinc,
+        'cosinus':lambda x:(1+np.cos(np.pi*x))/2}
+
+def poids(N,noyau='Dirichlet'):
+    '''poids w_n des harmoniques n=0..N'''
+    return NOYAUX[noyau](np.arange(N+1)/(N+1))
+
+def reconstruction(a,b,N,noyau='Dirichlet',M=None):
+    '''somme partielle pondérée jusqu'au rang N, sur les M instants kT/M d'une
+    période (par défaut M>=16(N+1)), par une FFT réelle inverse'''
+    M=M or scipy.fft.next_fast_len(16*(N+1),real=True)
+    X=np.zeros(M//2+1,dtype=complex)
+    X[:N+1]=(a[:N+1]-1j*b[:N+1])*poids(N,noyau)*(M/2)
+    X[0]=a[0]*M
+    return scipy.fft.irfft(X,M)
+
+def balayage(points,N_valeurs,noyau='Dirichlet',T=1.):
+    '''
+        dépassement et erreur quadratique des sommes pondérées d'un signal affine
+        par morceaux (cf. coefficients_affines), pour chaque N de N_valeurs
+        : return : dépassement (max S_N - max f, rapporté à max f - min f) et
+                   erreur quadratique moyenne (racine de la moyenne de (S_N-f)²)
+    '''
+    N_valeurs=np.asarray(N_valeurs,dtype=int)
+    a,b=coefficients_affines(points,N_valeurs.max(),T)
+    ta,tb,ya,yb,s=_segments(points,T)
+    carre_moyen=np.sum((tb-ta)*(ya**2+ya*yb+yb**2)/3)/T
+    energie=(a**2+b**2)/2
+    y=np.asarray(points,dtype=float)[:,1]
+    depassement=np.empty(len(N_valeurs))
+    erreur=np.empty(len(N_valeurs))
+    for k,N in enumerate(N_valeurs):
+        w=poids(N,noyau)
+        S=reconstruction(a,b,N,noyau)
+        depassement[k]=(S.max()-y.max())/(y.max()-y.min())
+        # ||f-S_N||² = ||f||² - a_0² - somme_n (a_n²+b_n²)/2 (2w_n-w_n²)
+        e2=carre_moyen-a[0]**2-np.dot(energie[1:N+1],w[1:]*(2-w[1:]))
+        erreur[k]=np.sqrt(max(e2,0.))
+    return depassement,erreur
+
+if __name__=='__main__':
+    import time
+    fig,(ax1,ax2,ax3)=plt.subplots(1,3)
+    # trapèze avec une discontinuité : comparaison avec la FFT d'un échantillonnage fin
+    points=[(0,0),(0.2,1),(0.5,1),(0.5,-0.5),(0.8,0)]
+    t0=time.time()
+    a,b=coefficients_affines(points,10**5)
+    print('10^5 harmoniques : %.2f s' % (time.time()-t0))
+    M=2**20
+    t=np.arange(M)/M
+    tp,yp=np.array(points).T
+    f=np.interp(t,np.append(tp,1),np.append(yp,0))
+    c=np.fft.rfft(f)/M
+    n=np.arange(1,41)
+    ax1.semilogy(n,np.hypot(a[n],b[n]),'o',label='coefficients exacts')
+    ax1.semilogy(n,2*np.abs(c[n]),'+',label='FFT de %d échantillons' % M)
+    ax1.set_xlabel('rang n')
+    ax1.set_ylabel('amplitude de l\'harmonique')
+    ax1.legend()
+
+    # créneau : dépassement et erreur quadratique selon le noyau de sommation
+    creneau=[(0,1),(0.5,1),(0.5,-1),(1,-1)]
+    N_valeurs=np.unique(np.geomspace(1,10**5,60).astype(int))
+    for noyau in NOYAUX:
+        t0=time.time()
+        depassement,erreur=balayage(creneau,N_valeurs,noyau)
+        print('%s : %d valeurs de N en %.2f s' % (noyau,len(N_valeurs),time.time()-t0))
+        ax2.semilogx(N_valeurs,100*depassement,label=noyau)
+        ax3.loglog(N_valeurs,erreur,label=noyau)
+    ax2.set_xlabel('N')
+    ax2.set_ylabel('dépassement (% du saut)')
+    ax2.legend()
+    ax3.set_xlabel('N')
+    ax3.set_ylabel('erreur quadratique')
+    ax3.legend()
+    plt.show()
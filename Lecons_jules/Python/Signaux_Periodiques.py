@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Bibliothèque de signaux périodiques et de bruits, commune aux
+démonstrations de séries de Fourier (Décomposition_créneaux,
+Décomposition_triangle, Décomposition_tous).
+
+Tous les signaux sont des expressions fermées de la phase réduite
+    phi = (t-retard)/T modulo 1, dans [0,1[,
+évaluées d'un bloc sur des tableaux numpy (pas de np.vectorize, pas de
+boucle Python) : 10^7 échantillons s'obtiennent en quelques dizaines de
+millisecondes. Les bruits sont tirés d'un unique générateur
+(numpy.random.Generator) initialisé par une graine, donc reproductibles.
+"""
+import numpy as np
+
+def phase(t,T=1.,retard=0.):
+    '''phase réduite (t-retard)/T modulo 1, dans [0,1['''
+    phi=np.subtract(t,retard,dtype=float)
+    phi*=1/T
+    phi-=np.floor(phi)
+    return phi
+
+def creneau(t,T=1.,rapport_cyclique=0.5,bas=-1.,haut=1.,retard=0.):
+    '''créneau valant haut sur la fraction rapport_cyclique de chaque période
+    (à partir de t=retard), bas ailleurs'''
+    return np.where(phase(t,T,retard)<rapport_cyclique,haut,bas)
+
+def impulsions(t,T=1.,duree=0.1,hauteur=1.,retard=0.):
+    '''train d'impulsions rectangulaires de durée duree, commençant à t=retard'''
+    return creneau(t,T,duree/T,0.,hauteur,retard)
+
+def triangle(t,T=1.,bas=0.,haut=1.,sommet=0.5,retard=0.):
+    '''triangle montant de bas (en t=retard) à haut (à la fraction sommet de la
+    période), puis redescendant ; sommet=1 donne une dent de scie'''
+    phi=phase(t,T,retard)
+    if sommet<=0:
+        forme=1-phi
+    elif sommet>=1:
+        forme=phi
+    else:
+        # la plus petite des deux pentes est celle de la portion en cours
+        forme=np.minimum(phi/sommet,(1-phi)/(1-sommet))
+    forme*=haut-bas
+    forme+=bas
+    return forme
+
+def scie(t,T=1.,bas=-1.,haut=1.,retard=0.):
+    '''dent de scie montant de bas à haut sur chaque période'''
+    phi=phase(t,T,retard)
+    phi*=haut-bas
+    phi+=bas
+    return phi
+
+def bruit_blanc(n,graine=None,amplitude=1.,loi='uniforme'):
+    '''
+        n échantillons de bruit blanc
+        : param graine : graine (ou Generator) du générateur aléatoire
+        : param loi : 'uniforme' (dans [-amplitude, amplitude[) ou 'normale'
+                      (écart type amplitude)
+    '''
+    rng=np.random.default_rng(graine)
+    if loi=='normale':
+        return amplitude*rng.standard_normal(n)
+    x=rng.random(n)
+    x*=2*amplitude
+    x-=amplitude
+    return x
+
+def bruit_rose(n,graine=None,amplitude=1.):
+    '''n échantillons de bruit rose (densité spectrale en 1/f), d'écart type
+    amplitude : bruit blanc gaussien filtré dans l'espace de Fourier'''
+    rng=np.random.default_rng(graine)
+    spectre=np.fft.rfft(rng.standard_normal(n))
+    f=np.arange(1,len(spectre))
+    spectre[0]=0
+    spectre[1:]/=np.sqrt(f)
+    x=np.fft.irfft(spectre,n)
+    return amplitude*x/np.std(x)
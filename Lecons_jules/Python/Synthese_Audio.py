@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Synthèse sonore, en temps réel, des sommes partielles de séries de Fourier
+des démonstrations Décomposition_créneaux, Décomposition_triangle et
+Décomposition_tous : on entend le son s'enrichir quand on ajoute des
+harmoniques.
+
+Le son est produit par blocs de taille fixe par un banc d'oscillateurs,
+un par harmonique, dont les phases restent continues d'un bloc à l'autre.
+L'oscillateur k est le nombre complexe z_k = exp(2i pi k f0 t) ; sur un
+bloc de B échantillons,
+    z_k(t0 + m/fe) = z_k(t0) * R_km,   R_km = exp(2i pi k f0 m/fe),
+où la matrice R (harmoniques x B) ne dépend que de f0 et est calculée une
+seule fois. Un bloc coûte donc un produit matrice-vecteur complexe,
+    s(m) = Re( somme_k w_k c_k z_k(t0) R_km ),   c_k = a_k - i b_k,
+puis z_k(t0) est multiplié par R_kB pour le bloc suivant. Quand le nombre
+d'harmoniques change, on passe des anciens poids w_k aux nouveaux par un
+fondu enchaîné sur un bloc, pour éviter les clics. Les harmoniques au-delà
+de fe/2 sont ignorées (repliement de spectre). 200 harmoniques à 44,1 kHz
+demandent une petite fraction d'un coeur.
+
+Les blocs sont écrits dans un fichier WAV (ecrit_wav), passés à une
+fonction quelconque (envoie) ou joués sur la carte son (joue, qui utilise
+le module sounddevice).
+"""
+import time
+import wave
+import numpy as np
+import matplotlib.pyplot as plt
+
+from Series_Fourier import coefficients_affines, poids
+
+class Synthetiseur:
+    def __init__(self,a,b,f0=220.,fe=44100,taille_bloc=512,volume=0.5):
+        '''
+            : param a, b : coefficients de Fourier (a[0] valeur moyenne, cf.
+                           Series_Fourier.coefficients_affines)
+            : param f0 : fréquence du fondamental (Hz)
+            : param fe : fréquence d'échantillonnage (Hz)
+            : param taille_bloc : nombre d'échantillons par bloc
+            : param volume : facteur appliqué au signal
+        '''
+        self.c=np.asarray(a,dtype=float)-1j*np.asarray(b,dtype=float)
+        self.fe=fe
+        self.taille_bloc=taille_bloc
+        self.volume=volume
+        self.K=len(self.c)-1
+        self.z=np.ones(self.K+1,dtype=complex)
+        self.blocs=0
+        self.frequence(f0)
+        self.w=self._poids(self.K,'Dirichlet')
+        self._w_suivants=None
+
+    def frequence(self,f0):
+        '''change la fréquence du fondamental (les phases restent continues)'''
+        self.f0=f0
+        k=np.arange(self.K+1)[:,None]
+        self.R=np.exp(2j*np.pi*f0/self.fe*k*np.arange(self.taille_bloc))
+        self.rotation=np.exp(2j*np.pi*f0/self.fe*k[:,0]*self.taille_bloc)
+        # harmoniques au-dessus de fe/2 : supprimées
+        self.audibles=np.arange(self.K+1)*f0<self.fe/2
+
+    def _poids(self,N,noyau):
+        w=np.zeros(self.K+1)
+        N=min(int(N),self.K)
+        w[:N+1]=poids(N,noyau)
+        return w
+
+    def regle(self,N,noyau='Dirichlet',immediat=False):
+        '''somme partielle jusqu'à l'harmonique N (noyau : cf. Series_Fourier),
+        atteinte par un fondu enchaîné sur le bloc suivant, ou dès le bloc
+        suivant si immediat (début d'un nouvel enregistrement, par exemple)'''
+        if immediat:
+            self.w,self._w_suivants=self._poids(N,noyau),None
+        else:
+            self._w_suivants=self._poids(N,noyau)
+
+    def bloc(self):
+        '''bloc suivant de taille_bloc échantillons'''
+        cz=self.volume*self.audibles*self.c*self.z
+        s=(self.w*cz)@self.R
+        if self._w_suivants is not None:
+            fondu=np.linspace(0,1,self.taille_bloc,endpoint=False)
+            s+=fondu*(((self._w_suivants-self.w)*cz)@self.R)
+            self.w,self._w_suivants=self._w_suivants,None
+        self.z*=self.rotation
+        self.blocs+=1
+        if self.blocs%1000==0:
+            self.z/=np.abs(self.z)     # élimine la dérive d'amplitude due aux arrondis
+        return s.real
+
+def envoie(synthetiseur,rappel,duree):
+    '''passe à rappel(bloc) les blocs successifs pendant duree (s)'''
+    for i in range(int(np.ceil(duree*synthetiseur.fe/synthetiseur.taille_bloc))):
+        rappel(synthetiseur.bloc())
+
+def ecrit_wav(synthetiseur,fichier,duree,changements=()):
+    '''
+        enregistre duree (s) de son dans un fichier WAV 16 bits mono
+        : param changements : couples (instant (s), N) auxquels on change le
+                              nombre d'harmoniques
+    '''
+    changements=sorted(changements)
+    with wave.open(fichier,'wb') as sortie:
+        sortie.setnchannels(1)
+        sortie.setsampwidth(2)
+        sortie.setframerate(synthetiseur.fe)
+        t=0.
+        def rappel(bloc):
+            nonlocal t
+            while changements and changements[0][0]<=t:
+                synthetiseur.regle(changements.pop(0)[1])
+            sortie.writeframes((np.clip(bloc,-1,1)*32767).astype('<i2').tobytes())
+            t+=synthetiseur.taille_bloc/synthetiseur.fe
+        envoie(synthetiseur,rappel,duree)
+
+def joue(synthetiseur):
+    '''joue le son en continu sur la carte son (module sounddevice) ; renvoie
+    le flux, à arrêter par flux.stop()'''
+    import sounddevice
+    def rappel(sortie,n,instant,etat):
+        sortie[:,0]=synthetiseur.bloc()
+    flux=sounddevice.OutputStream(samplerate=synthetiseur.fe,blocksize=synthetiseur.taille_bloc,
+                                  channels=1,dtype='float32',callback=rappel)
+    flux.start()
+    return flux
+
+
+if __name__=='__main__':
+    # créneau à 220 Hz : 1, 3, 10 puis 200 harmoniques, une seconde chacun
+    a,b=coefficients_affines([(0,1),(0.5,1),(0.5,-1),(1,-1)],200)
+    synthetiseur=Synthetiseur(a,b,f0=220.,volume=0.3)
+    synthetiseur.regle(1)
+
+    t0=time.time()
+    envoie(synthetiseur,lambda bloc:None,10.)
+    print('10 s de son (200 harmoniques) calculées en %.2f s' % (time.time()-t0))
+
+    ecrit_wav(synthetiseur,'creneau_harmoniques.wav',4.,[(0,1),(1,3),(2,10),(3,200)])
+    echantillons=[]
+    synthetiseur.regle(10)
+    envoie(synthetiseur,echantillons.append,0.02)
+    plt.plot(np.arange(len(np.concatenate(echantillons)))/synthetiseur.fe,np.concatenate(echantillons))
+    plt.xlabel('temps (s)')
+    plt.ylabel('signal')
+    plt.title('créneau à 220 Hz, 10 harmoniques (fondu enchaîné au début)')
+    plt.show()
@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+Fentes d'Young éclairées par une source étendue et polychromatique
+(cohérence spatiale et temporelle partielles).
+
+diffraction_fente_bx.I_young suppose une source ponctuelle monochromatique
+(cas que l'on retrouve ici avec alpha=0 et une seule longueur d'onde).
+Ici, pour une source de largeur angulaire non nulle (points sources vus
+sous l'angle alpha depuis les fentes) et de spectre S(lambda) quelconque
+(doublet du sodium, LED, lumière blanche), on somme les éclairements
+incohérents de tous les couples (point source, longueur d'onde) :
+
+    I(theta) = somme_{s,lambda} w_s S_lambda F_lambda(theta)
+               * (1+cos(2 pi e (sin(theta)+alpha_s)/lambda))/2
+
+où F_lambda est le terme de diffraction par une fente. Le terme
+d'interférence se factorise : la somme sur les points sources donne, pour
+chaque longueur d'onde, le degré de cohérence complexe
+    gamma_lambda = somme_s w_s exp(2i pi e alpha_s/lambda),
+si bien que la somme (points sources x longueurs d'onde x écran) se réduit
+à deux produits (points sources x longueurs d'onde) puis (longueurs d'onde
+x écran), traités par blocs de longueurs d'onde pour borner la mémoire.
+10^4 longueurs d'onde sur 1000 points d'écran prennent moins d'une seconde.
+
+Avec C = somme S F gamma exp(2i pi e sin(theta)/lambda) et A = somme S F,
+l'éclairement vaut (A+Re C)/2 et la visibilité locale des franges |C|/A.
+En pondérant les longueurs d'onde par les fonctions colorimétriques CIE, on
+obtient les couleurs vraies des franges en lumière blanche.
+"""
+
+import time
+import numpy as np
+import matplotlib.pyplot as plt
+
+# mêmes paramètres que diffraction_fente_bx
+a=0.24e-3       # largeur des fentes
+e=2e-3          # distance entre les fentes
+lambda0=633.e-9
+
+TAILLE_BLOC=2**20   # nombre d'éléments (longueurs d'onde x écran) par bloc
+
+
+""" -----------------------
+    Sources
+    ----------------------- """
+def _normalise(lambdas,poids):
+    return lambdas,poids/np.sum(poids)
+
+def sodium(n=200,largeur=0.02e-9):
+    '''doublet du sodium (589,0 nm et 589,6 nm, rapport d'intensité 2:1),
+    raies gaussiennes de largeur à mi-hauteur largeur'''
+    lambdas=np.linspace(588.9e-9,589.7e-9,n)
+    sigma=largeur/(2*np.sqrt(2*np.log(2)))
+    poids=(2*np.exp(-(lambdas-588.995e-9)**2/(2*sigma**2))
+           +np.exp(-(lambdas-589.592e-9)**2/(2*sigma**2)))
+    return _normalise(lambdas,poids)
+
+def led(centre=630e-9,largeur=20e-9,n=200):
+    '''LED : spectre gaussien de largeur à mi-hauteur largeur'''
+    sigma=largeur/(2*np.sqrt(2*np.log(2)))
+    lambdas=np.linspace(centre-4*sigma,centre+4*sigma,n)
+    return _normalise(lambdas,np.exp(-(lambdas-centre)**2/(2*sigma**2)))
+
+def blanche(n=1000,T=5800.):
+    '''lumière blanche : corps noir à la température T, sur le visible'''
+    lambdas=np.linspace(380e-9,780e-9,n)
+    h,c,kB=6.62607015e-34,299792458.,1.380649e-23
+    return _normalise(lambdas,1/(lambdas**5*np.expm1(h*c/(lambdas*kB*T))))
+
+def source_etendue(largeur,distance,n=50):
+    '''fente source de largeur donnée, à distance des fentes d'Young :
+    directions alpha des points sources et poids (uniformes)'''
+    if largeur==0:
+        return np.zeros(1),np.ones(1)
+    alpha=(np.arange(n)+0.5)/n*largeur/distance-largeur/(2*distance)
+    return alpha,np.full(n,1/n)
+
+
+""" -----------------------
+    Fonctions colorimétriques CIE 1931 (approximation analytique de
+    Wyman, Sloan et Shirley, 2013) et passage en sRGB
+    ----------------------- """
+def _lobe(l,mu,s1,s2):
+    return np.exp(-0.5*((l-mu)/np.where(l<mu,s1,s2))**2)
+
+def cie_xyz(lambdas):
+    '''fonctions x, y, z de la CIE aux longueurs d'onde données (tableau 3 x n)'''
+    l=np.asarray(lambdas)*1e9
+    return np.array([1.056*_lobe(l,599.8,37.9,31.0)+0.362*_lobe(l,442.0,16.0,26.7)
+                     -0.065*_lobe(l,501.1,20.4,26.2),
+                     0.821*_lobe(l,568.8,46.9,40.5)+0.286*_lobe(l,530.9,16.3,31.1),
+                     1.217*_lobe(l,437.0,11.8,36.0)+0.681*_lobe(l,459.0,26.0,13.8)])
+
+XYZ_SRGB=np.array([[3.2406,-1.5372,-0.4986],
+                   [-0.9689,1.8758,0.0415],
+                   [0.0557,-0.2040,1.0570]])
+
+def srgb(XYZ):
+    '''couleurs XYZ (3 x n) -> sRGB affichables (n x 3), la plus lumineuse
+    ramenée à 1, les couleurs hors gamut ramenées sur son bord'''
+    rgb=np.clip(XYZ_SRGB@XYZ,0,None)
+    rgb/=rgb.max()
+    rgb=np.where(rgb<=0.0031308,12.92*rgb,1.055*rgb**(1/2.4)-0.055)
+    return rgb.T
+
+
+""" -----------------------
+    Calcul des franges
+    ----------------------- """
+def sommes(theta,lambdas,poids,alpha=np.zeros(1),poids_source=np.ones(1),
+           a=a,e=e,taille_bloc=TAILLE_BLOC):
+    '''
+        sommes A et C (voir l'en-tête) pour chaque ligne de poids
+        : param theta : directions d'observation
+        : param lambdas : longueurs d'onde
+        : param poids : poids spectraux, tableau de forme (m, len(lambdas)) ou (len(lambdas),)
+        : param alpha, poids_source : points de la source (cf. source_etendue)
+        : return : A (réel) et C (complexe), de forme (m, len(theta)) ou (len(theta),)
+    '''
+    s=np.sin(np.asarray(theta,dtype=float))
+    poids=np.asarray(poids,dtype=float)
+    A=np.zeros(poids.shape[:-1]+s.shape)
+    C=np.zeros(poids.shape[:-1]+s.shape,dtype=complex)
+    pas=max(1,taille_bloc//max(len(s),len(alpha)))
+    for debut in range(0,len(lambdas),pas):
+        l=lambdas[debut:debut+pas,None]
+        p=poids[...,debut:debut+pas]
+        gamma=np.exp(2j*np.pi*e*alpha[None,:]/l)@poids_source
+        F=np.sinc(a*s/l)**2
+        A+=p@F
+        C+=(p*gamma)@(F*np.exp(2j*np.pi*e*s/l))
+    return A,C
+
+def franges(theta,source,etendue=(np.zeros(1),np.ones(1)),**kw):
+    '''éclairement (normalisé) et visibilité locale des franges'''
+    lambdas,poids=source
+    A,C=sommes(theta,lambdas,poids,*etendue,**kw)
+    return (A+C.real)/2,np.abs(C)/A
+
+def couleurs(theta,source,etendue=(np.zeros(1),np.ones(1)),**kw):
+    '''couleurs vraies des franges (tableau len(theta) x 3, sRGB)'''
+    lambdas,poids=source
+    A,C=sommes(theta,lambdas,poids*cie_xyz(lambdas),*etendue,**kw)
+    return srgb((A+C.real)/2)
+
+
+if __name__=='__main__':
+    theta=np.linspace(-np.pi/1000,np.pi/1000,1000)
+
+    t=time.time()
+    I,V=franges(theta,blanche(10**4))
+    print('10^4 longueurs d\'onde : %.2f s' % (time.time()-t))
+
+    cas={'sodium, source ponctuelle':(sodium(),source_etendue(0,1)),
+         'sodium, fente source de 0,2 mm à 1 m':(sodium(),source_etendue(0.2e-3,1)),
+         'LED rouge (20 nm)':(led(),source_etendue(0,1)),
+         'lumière blanche':(blanche(),source_etendue(0,1))}
+    fig,axes=plt.subplots(len(cas)+1,1,sharex=True)
+    for ax,(nom,(source,etendue)) in zip(axes,cas.items()):
+        I,V=franges(theta,source,etendue)
+        ax.plot(theta,I/I.max(),label='I/I_max')
+        ax.plot(theta,V,'--',label='visibilité')
+        ax.set_title('%s : visibilité au centre %.2f' % (nom,V[len(theta)//2]))
+        ax.legend(loc=1)
+    rgb=couleurs(theta,blanche())
+    axes[-1].imshow(rgb[None,:,:],aspect='auto',extent=[theta[0],theta[-1],0,1])
+    axes[-1].set_yticks([])
+    axes[-1].set_title('franges en lumière blanche (couleurs vraies)')
+    axes[-1].set_xlabel('theta (rad)')
+    plt.show()
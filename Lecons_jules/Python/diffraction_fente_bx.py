@@ -11,7 +11,8 @@ from matplotlib.widgets import Slider, Button, RadioButtons
 
 plt.close("all")
 
-# Diffraction par une fente
+# Diffraction par une fente (np.sinc(x) vaut sin(pi x)/(pi x) : premier zéro
+# en sin(theta)=lambda0/a)
 
 theta=np.linspace(-np.pi/1000,np.pi/1000,1000)
 a=0.24e-3
@@ -19,21 +20,51 @@ D=1
 lambda0=633.e-9
 e=2e-3  #Distance iter-fentes
 
-I_fente=(np.sinc(np.pi*a*np.sin(theta)/lambda0))**2
+I_fente=(np.sinc(a*np.sin(theta)/lambda0))**2
 
-I_young=(np.sinc(np.pi*a*np.sin(theta)/lambda0))**2*(np.cos(np.pi*e*np.sin(theta)/lambda0))**2
+I_young=(np.sinc(a*np.sin(theta)/lambda0))**2*(np.cos(np.pi*e*np.sin(theta)/lambda0))**2
 
 
 N0=20
 def I_reseau(theta,N):
-    return (np.sinc(np.pi*a*np.sin(theta)/lambda0))**2*((np.sin(int(N)*np.pi*e*np.sin(theta)/lambda0)/np.sin(np.pi*e*np.sin(theta)/lambda0)))**2/(int(N)**2)
+    return (np.sinc(a*np.sin(theta)/lambda0))**2*((np.sin(int(N)*np.pi*e*np.sin(theta)/lambda0)/np.sin(np.pi*e*np.sin(theta)/lambda0)))**2/(int(N)**2)
+
+class Reseau:
+    '''
+    Évaluateur de I_reseau sur une grille theta fixée, pour le curseur :
+    le terme de diffraction, u=pi*e*sin(theta)/lambda0 (ramené dans
+    [-pi/2,pi/2]) et 1/sin²(u) sont calculés une seule fois. Pour un nouveau
+    N il ne reste qu'un sinus et deux produits,
+        I = [I_fente/sin²(u)] * sin²(N u) / N²,
+    et les maxima principaux (u=0, où le quotient vaut 0/0) valent I_fente.
+    '''
+    def __init__(self,theta,a=a,e=e,lambda0=lambda0):
+        u=np.pi*e*np.sin(theta)/lambda0
+        self.u=u-np.pi*np.round(u/np.pi)
+        self.maxima=np.abs(self.u)<1e-8
+        self.fente=np.sinc(a*np.sin(theta)/lambda0)**2
+        self.A=np.where(self.maxima,0.,self.fente/np.where(self.maxima,1.,np.sin(self.u))**2)
+        self.fente_maxima=self.fente[self.maxima]
+
+    def __call__(self,N):
+        N=int(N)
+        if N<1:
+            return np.zeros_like(self.u)
+        I=np.sin(N*self.u)
+        I*=I
+        I*=self.A
+        I/=N**2
+        I[self.maxima]=self.fente_maxima
+        return I
+
+reseau=Reseau(theta)
 
 fig, ax = plt.subplots()
 plt.subplots_adjust(left=0.25, bottom=0.25)
 plt.plot(theta,I_fente,label="Diffraction par une fente")
 plt.plot(theta,I_young,label="Fentes d'Young")
 #plt.plot(theta,I_reseau,label="Diffraction par %.f fentes" %(N0))
-l, = plt.plot(theta,I_reseau(theta,N0), lw=2, label="Diffraction par %.f fentes" %(N0))
+l, = plt.plot(theta,reseau(N0), lw=2, label="Diffraction par %.f fentes" %(N0))
 
 plt.xlabel('Distance d (m)')
 plt.ylabel(u"I/I_0")
@@ -45,7 +76,7 @@ ioN = Slider(axN, 'N', 0, 600,valfmt='%0.0f',valinit=N0) # définition de l'inte
 
 def update(val):
     N = ioN.val
-    l.set_ydata(I_reseau(theta,N))
+    l.set_ydata(reseau(N))
     fig.canvas.draw_idle()
     
 ioN.on_changed(update)
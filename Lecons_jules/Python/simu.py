@@ -4,49 +4,75 @@
 # In[1]:
 
 
+from functools import lru_cache
 from ipywidgets import *
-import matplotlib.pyplot as plt  
+import matplotlib.pyplot as plt
 import numpy as np
 
 
 # In[2]:
 
 
-N= 1;
 d = 0.000001;
 l = 632e-9;
 f = 1;
 a = 0.00002;
-  
-X = np.arange(-0.4,0.4,0.0001) ; 
-S = (np.sinc(np.pi*X*d/(l*f))**2);
-I = (np.sinc(np.pi*X*d/(l*f))**2)*((np.sin(N*np.pi*X*a/(l*f)))/(np.sin(np.pi*X*a/(l*f))))**2/N**2;
-plt.plot(X, I,X,S)
-plt.rcParams['figure.figsize'] = [30, 12]
-plt.xlabel('X')  
-plt.ylabel('I')    
-plt.grid(True)  
-plt.show()
 
-
-# In[4]:
-
-
-N= 2;
-d = 0.000001;
-l = 632e-9;
-f = 1;
-a = 0.00002;
-  
-X = np.arange(-0.4,0.4,0.0001) ; 
-S = (np.sinc(np.pi*X*d/(l*f))**2);
-I = (np.sinc(np.pi*X*d/(l*f))**2)*((np.sin(N*np.pi*X*a/(l*f)))/(np.sin(np.pi*X*a/(l*f))))**2/N**2;
-plt.plot(X, I,X,S)
-plt.rcParams['figure.figsize'] = [30, 12]
-plt.xlabel('X')  
-plt.ylabel('I')    
-plt.grid(True)  
-plt.show()
+# grille d'observation (debut, fin, pas) : un tuple, pour servir de cle de cache
+GRILLE = (-0.4, 0.4, 0.0001)
+X = np.arange(*GRILLE) ;
+
+@lru_cache(maxsize=32)
+def enveloppe(d, l, f, grille=GRILLE):
+    # terme de diffraction par une fente, calcule une seule fois par
+    # (d, l, f, grille)
+    X = np.arange(*grille)
+    S = np.sinc(np.pi*X*d/(l*f))**2
+    S.flags.writeable = False
+    return S
+
+def dirichlet2(N, u):
+    # (sin(N u)/(N sin u))**2 pour un tableau de N (colonne) et de u (ligne).
+    # u est ramene dans [-pi/2, pi/2] (la fonction est pi-periodique au signe
+    # pres) et, au voisinage des maxima principaux u = m pi, ou le quotient
+    # vaut 0/0, on utilise le developpement 1 - (N**2-1) u**2/3.
+    N = np.asarray(N, dtype=float).reshape(-1, 1)
+    u = u - np.pi*np.round(u/np.pi)
+    petit = np.abs(u) < 1e-8
+    u_sur = np.where(petit, 1.0, u)
+    D = (np.sin(N*u_sur)/(N*np.sin(u_sur)))**2
+    return np.where(petit, 1 - (N**2-1)*u**2/3, D)
+
+def intensite(N, d=d, l=l, f=f, a=a, grille=GRILLE):
+    # intensite I(X) pour un ou plusieurs nombres de fentes N a la fois :
+    # tableau de forme (len(N), len(X)), X = np.arange(*grille)
+    X = np.arange(*grille)
+    return enveloppe(d, l, f, grille)*dirichlet2(N, np.pi*X*a/(l*f))
+
+I = intensite([1, 2])
+for n, In in zip([1, 2], I):
+    plt.figure()
+    plt.plot(X, In, X, enveloppe(d, l, f, GRILLE))
+    plt.rcParams['figure.figsize'] = [30, 12]
+    plt.xlabel('X')
+    plt.ylabel('I')
+    plt.title('N = %d' % n)
+    plt.grid(True)
+    plt.show()
+
+
+# In[3]:
+
+
+def trace(N=1, a=a):
+    plt.plot(X, intensite(N, a=a, grille=GRILLE)[0], X, enveloppe(d, l, f, GRILLE))
+    plt.xlabel('X')
+    plt.ylabel('I')
+    plt.grid(True)
+    plt.show()
+
+interact(trace, N=IntSlider(value=1, min=1, max=50),
+         a=FloatSlider(value=a, min=0.000005, max=0.0001, step=0.000001, readout_format='.1e'));
 
 
 # In[ ]: